@@ -3,10 +3,14 @@
 Etsy Scraper Build Script
 Uses PyInstaller to package as standalone executable
 """
+import ast
+import hashlib
+import json
 import os
 import sys
 import shutil
 import subprocess
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 # Project info
@@ -16,136 +20,458 @@ APP_VERSION = "1.0.0"
 # Project root
 PROJECT_ROOT = Path(__file__).parent.absolute()
 SRC_DIR = PROJECT_ROOT / "src" / "etsy_scraper"
+UPX_DIR = PROJECT_ROOT / "tools" / "upx"
+
+# Platform details, resolved once at import
+PLATFORM_NAME = {"darwin": "macOS", "win32": "Windows"}.get(sys.platform, "Linux")
+EXE_NAME = f"{APP_NAME}.exe" if sys.platform == "win32" else APP_NAME
+ICON_EXT = {"darwin": "icns", "win32": "ico"}.get(sys.platform, "png")
+
+# Optional app icon: assets/icon.{icns,ico,png}
+_icon_path = os.path.join(str(PROJECT_ROOT), "assets", f"icon.{ICON_EXT}")
+ICON_PATH = _icon_path if os.path.isfile(_icon_path) else None
+
+# PyInstaller options shared by every build
+BASE_ARGS = ("--noconfirm",)
+
+# Cache for pre-packed third-party resources, shared between builds
+CACHE_DIR = Path.home() / ".cache" / "etsy_build"
+
+
+# Suffix for trees renamed out of the way by move_to_trash()
+TRASH_SUFFIX = ".deleteme"
+
+
+def move_to_trash(path: Path):
+    """Rename a directory tree out of the way so its path can be reused immediately
+    
+    The renamed tree (<name>.deleteme) is deleted later by delete_trash().
+    Falls back to shutil.rmtree if the rename fails.
+    """
+    trash = path.with_name(f"{path.name}{TRASH_SUFFIX}")
+    try:
+        if trash.exists():
+            # Leftover from an earlier background delete that has not finished
+            shutil.rmtree(trash, ignore_errors=True)
+        os.rename(path, trash)
+    except OSError:
+        shutil.rmtree(path, ignore_errors=True)
+
+
+def delete_trash(paths: list):
+    """Delete renamed trees with a single detached rm/rmdir process"""
+    if not paths:
+        return
+    
+    if sys.platform == "win32":
+        subprocess.Popen(
+            ["cmd", "/c", "rmdir", "/s", "/q", *map(str, paths)],
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+            creationflags=subprocess.CREATE_NO_WINDOW,
+        )
+    else:
+        subprocess.Popen(
+            ["rm", "-rf", *map(str, paths)],
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
 
 
 def clean_build():
     """Clean build directories"""
     dirs_to_clean = ['build', 'dist', '__pycache__']
+    
+    # Renames are cheap, do them one by one
+    # The generated .spec is kept, it is rewritten by generate_spec() on change
     for d in dirs_to_clean:
         path = PROJECT_ROOT / d
         if path.exists():
             print(f"Cleaning {d}...")
-            shutil.rmtree(path)
+            move_to_trash(path)
     
-    # Clean .spec files
-    for spec_file in PROJECT_ROOT.glob("*.spec"):
-        spec_file.unlink()
-        print(f"Cleaning {spec_file.name}...")
+    # Sweep the renamed trees plus leftovers of earlier background deletes once,
+    # scandir avoids extra stats
+    with os.scandir(PROJECT_ROOT) as it:
+        trash = [
+            Path(entry.path) for entry in it
+            if entry.name.endswith(TRASH_SUFFIX) and entry.is_dir(follow_symlinks=False)
+        ]
+    delete_trash(trash)
 
 
-def build_app():
-    """Build application"""
-    print("=" * 60)
-    print(f"Building {APP_NAME} v{APP_VERSION}")
-    print("=" * 60)
+def ensure_ctk_cache() -> Path:
+    """Pre-pack customtkinter resources once per customtkinter version
     
-    # Detect OS
-    if sys.platform == "darwin":
-        platform_name = "macOS"
-        sep = ":"
-    elif sys.platform == "win32":
-        platform_name = "Windows"
-        sep = ";"
-    else:
-        platform_name = "Linux"
-        sep = ":"
+    Copies the themes/fonts/icons shipped inside the customtkinter package
+    into a versioned cache directory. Later builds ship it as spec datas
+    instead of re-walking the whole package with --collect-all.
     
-    print(f"Target platform: {platform_name}")
-    print()
+    Returns:
+        Path to the cached customtkinter resource directory
+    """
+    from importlib.metadata import version
+    from importlib.util import find_spec
+    
+    ctk_version = version("customtkinter")
+    digest = hashlib.sha1(ctk_version.encode()).hexdigest()[:12]
+    cache_path = CACHE_DIR / f"ctk-{digest}" / "customtkinter"
     
-    # Main script and other modules
-    main_script = str(SRC_DIR / "gui.py")
+    if cache_path.exists():
+        print(f"Using cached customtkinter {ctk_version} resources")
+        return cache_path
     
-    pyinstaller_args = [
-        "pyinstaller",
-        "--name", APP_NAME,
-        "--windowed",
-        "--onedir",
-        "--noconfirm",
-        "--clean",
+    print(f"Packing customtkinter {ctk_version} resources...")
+    ctk_dir = Path(find_spec("customtkinter").origin).parent
+    tmp_path = cache_path.with_name("customtkinter.tmp")
+    shutil.rmtree(tmp_path, ignore_errors=True)
+    shutil.copytree(
+        ctk_dir, tmp_path,
+        ignore=shutil.ignore_patterns("*.py", "*.pyc", "__pycache__"),
+    )
+    os.replace(tmp_path, cache_path)
+    return cache_path
+
+
+SPEC_HEADER = """\
+# -*- mode: python ; coding: utf-8 -*-
+# Generated by build.py - edit build.py instead, this file is rewritten on change
+
+a = Analysis(
+    [{main_script!r}],
+    pathex={pathex!r},
+    binaries=[],
+    datas={datas!r},
+    hiddenimports={hiddenimports!r},
+    hookspath=[],
+    hooksconfig={{}},
+    runtime_hooks=[],
+    excludes=[],
+    noarchive=False,
+)
+pyz = PYZ(a.pure)
+"""
+
+ONEDIR_TEMPLATE = """
+exe = EXE(
+    pyz,
+    a.scripts,
+    [],
+    exclude_binaries=True,
+    name={app_name!r},
+    icon={icon!r},
+    debug=False,
+    bootloader_ignore_signals=False,
+    strip=False,
+    upx={upx!r},
+    console=False,
+    disable_windowed_traceback=False,
+    argv_emulation=False,
+    target_arch=None,
+    codesign_identity=None,
+    entitlements_file=None,
+)
+coll = COLLECT(
+    exe,
+    a.binaries,
+    a.datas,
+    strip=False,
+    upx={upx!r},
+    upx_exclude=[],
+    name={app_name!r},
+)
+"""
+
+ONEFILE_TEMPLATE = """
+exe = EXE(
+    pyz,
+    a.scripts,
+    a.binaries,
+    a.datas,
+    [],
+    name={app_name!r},
+    icon={icon!r},
+    debug=False,
+    bootloader_ignore_signals=False,
+    strip=False,
+    upx={upx!r},
+    upx_exclude=[],
+    runtime_tmpdir=None,
+    console=False,
+    disable_windowed_traceback=False,
+    argv_emulation=False,
+    target_arch=None,
+    codesign_identity=None,
+    entitlements_file=None,
+)
+"""
+
+BUNDLE_TEMPLATE = """
+app = BUNDLE(
+    {target},
+    name={bundle_name!r},
+    icon={icon!r},
+    bundle_identifier={bundle_id!r},
+)
+"""
+
+# Build variants selectable with --variants
+BUILD_VARIANTS = {
+    "onedir": {"onefile": False},
+    "onefile": {"onefile": True},
+}
+
+HIDDEN_IMPORTS = [
+    # Dependencies (selenium submodules come from scan_selenium_imports)
+    "requests",
+    "urllib3",
+    "certifi",
+    "charset_normalizer",
+    "idna",
+    "customtkinter",
+    "PIL",
+    "PIL.Image",
+    "PIL._tkinter_finder",
+    "tkinter",
+    "tkinter.filedialog",
+    "tkinter.messagebox",
+    "json",
+    "threading",
+    "datetime",
+    "pathlib",
+    "platform",
+    "re",
+    "collections",
+    "subprocess",
+]
+
+
+def scan_selenium_imports() -> list:
+    """Find the selenium modules our sources actually import
+    
+    Parses SRC_DIR with ast instead of keeping a hand-maintained list, so
+    PyInstaller only analyses the selenium submodules that are used.
+    The result is cached in build/ keyed by the source file mtimes.
+    
+    Returns:
+        Sorted list of selenium module names
+    """
+    from importlib.util import find_spec
+    
+    sources = sorted(SRC_DIR.glob("*.py"))
+    key = hashlib.sha1(
+        "".join(f"{p.name}:{p.stat().st_mtime_ns};" for p in sources).encode()
+    ).hexdigest()
+    cache_file = PROJECT_ROOT / "build" / ".selenium_imports.json"
+    
+    if cache_file.exists():
+        try:
+            cached = json.loads(cache_file.read_text(encoding="utf-8"))
+            if cached.get("key") == key:
+                return cached["modules"]
+        except (ValueError, KeyError):
+            pass
+    
+    def is_module(name: str) -> bool:
+        try:
+            return find_spec(name) is not None
+        except (ImportError, ValueError):
+            return False
+    
+    modules = {"selenium"}
+    for path in sources:
+        tree = ast.parse(path.read_text(encoding="utf-8"), filename=str(path))
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                modules.update(a.name for a in node.names if a.name.startswith("selenium"))
+            elif isinstance(node, ast.ImportFrom) and (node.module or "").startswith("selenium"):
+                modules.add(node.module)
+                # `from selenium import webdriver` imports a submodule, not a name
+                for a in node.names:
+                    if is_module(f"{node.module}.{a.name}"):
+                        modules.add(f"{node.module}.{a.name}")
+    
+    result = sorted(modules)
+    cache_file.parent.mkdir(parents=True, exist_ok=True)
+    cache_file.write_text(json.dumps({"key": key, "modules": result}), encoding="utf-8")
+    return result
+
+
+def generate_spec(config: dict) -> Path:
+    """Write the spec for a build variant, only touching it when its content changes
+    
+    Keeping the spec stable between runs lets PyInstaller reuse the cached
+    Analysis in build/ instead of re-parsing CLI options every build.
+    
+    Args:
+        config: Build config, see build_app()
         
+    Returns:
+        Path to the spec file
+    """
+    if config["isolated"]:
+        spec_path = PROJECT_ROOT / f"{APP_NAME}-{config['name']}.spec"
+    else:
+        spec_path = PROJECT_ROOT / f"{APP_NAME}.spec"
+    
+    content = SPEC_HEADER.format(
+        main_script=str(SRC_DIR / "gui.py"),
         # Add src directory to Python path
-        "--paths", str(SRC_DIR),
-        
-        # Add other source files as data (will be extracted to _MEIPASS)
-        "--add-data", f"{SRC_DIR / 'section_scraper.py'}{sep}.",
-        "--add-data", f"{SRC_DIR / 'real_chrome_scraper.py'}{sep}.",
-        "--add-data", f"{SRC_DIR / 'utils.py'}{sep}.",
-        
-        # Hidden imports for our modules
-        "--hidden-import", "section_scraper",
-        "--hidden-import", "real_chrome_scraper",
-        "--hidden-import", "utils",
-        
-        # Hidden imports for dependencies
-        "--hidden-import", "selenium",
-        "--hidden-import", "selenium.webdriver",
-        "--hidden-import", "selenium.webdriver.chrome.options",
-        "--hidden-import", "selenium.webdriver.chrome.service",
-        "--hidden-import", "selenium.webdriver.common.by",
-        "--hidden-import", "selenium.webdriver.support.ui",
-        "--hidden-import", "selenium.webdriver.support.expected_conditions",
-        "--hidden-import", "requests",
-        "--hidden-import", "urllib3",
-        "--hidden-import", "certifi",
-        "--hidden-import", "charset_normalizer",
-        "--hidden-import", "idna",
-        "--hidden-import", "customtkinter",
-        "--hidden-import", "PIL",
-        "--hidden-import", "PIL.Image",
-        "--hidden-import", "PIL._tkinter_finder",
-        "--hidden-import", "tkinter",
-        "--hidden-import", "tkinter.filedialog",
-        "--hidden-import", "tkinter.messagebox",
-        "--hidden-import", "json",
-        "--hidden-import", "threading",
-        "--hidden-import", "datetime",
-        "--hidden-import", "pathlib",
-        "--hidden-import", "platform",
-        "--hidden-import", "re",
-        "--hidden-import", "collections",
-        "--hidden-import", "subprocess",
-        
-        # Collect all customtkinter resources
-        "--collect-all", "customtkinter",
-        
-        main_script,
-    ]
+        pathex=[str(SRC_DIR)],
+        # Our own modules are found by import analysis through pathex
+        datas=[
+            # customtkinter resources (pre-packed, see ensure_ctk_cache)
+            (str(config["ctk_resources"]), "customtkinter"),
+        ],
+        hiddenimports=HIDDEN_IMPORTS + scan_selenium_imports(),
+    )
+    
+    if config["onefile"]:
+        content += ONEFILE_TEMPLATE.format(app_name=APP_NAME, icon=ICON_PATH, upx=config["release"])
+    else:
+        content += ONEDIR_TEMPLATE.format(app_name=APP_NAME, icon=ICON_PATH, upx=config["release"])
     
     # macOS specific
     if sys.platform == "darwin":
-        pyinstaller_args.extend([
-            "--osx-bundle-identifier", "com.etsy.scraper",
-        ])
+        content += BUNDLE_TEMPLATE.format(
+            target="exe" if config["onefile"] else "coll",
+            bundle_name=f"{APP_NAME}.app",
+            bundle_id="com.etsy.scraper",
+            icon=ICON_PATH,
+        )
+    
+    if spec_path.exists() and spec_path.read_text(encoding="utf-8") == content:
+        print(f"Reusing {spec_path.name}")
+    else:
+        print(f"Writing {spec_path.name}")
+        spec_path.write_text(content, encoding="utf-8")
+    
+    return spec_path
+
+
+def deps_fingerprint() -> str:
+    """Hash of dependency lock files and interpreter version
+    
+    PyInstaller's cached analysis is only valid while the dependency set is
+    unchanged, so this decides whether an incremental build is safe.
+    """
+    h = hashlib.sha1(sys.version.encode())
+    for name in ("pyproject.toml", "poetry.lock"):
+        path = PROJECT_ROOT / name
+        if path.exists():
+            h.update(path.read_bytes())
+    return h.hexdigest()
+
+
+def build_app(config: dict) -> bool:
+    """Build application
+    
+    Args:
+        config: Build config with keys
+            - name: variant name (key of BUILD_VARIANTS)
+            - onefile: build a single executable instead of a folder
+            - fresh: pass --clean to PyInstaller (discard its analysis cache)
+            - isolated: use build/<name> and dist/<name> so several variants
+              can be built at the same time
+            - ctk_resources: cached customtkinter resource directory
+            - release: compress binaries with UPX (skipped for dev builds)
+            - verbose: show PyInstaller's INFO output
+    
+    Returns:
+        True if the build succeeded
+    """
+    print("=" * 60)
+    print(f"Building {APP_NAME} v{APP_VERSION} ({config['name']})")
+    print("=" * 60)
+    
+    print(f"Target platform: {PLATFORM_NAME}")
+    print()
+    
+    spec_path = generate_spec(config)
+    
+    dist_dir = PROJECT_ROOT / "dist"
+    work_dir = PROJECT_ROOT / "build"
+    pyinstaller_args = list(BASE_ARGS)
+    
+    # PyInstaller prints thousands of INFO lines, which stalls slow terminals
+    if not config["verbose"]:
+        pyinstaller_args += ["--log-level", "WARN"]
+    
+    # Separate work/dist paths avoid contention between parallel builds
+    if config["isolated"]:
+        dist_dir = dist_dir / config["name"]
+        work_dir = work_dir / config["name"]
+        pyinstaller_args += [
+            "--workpath", str(work_dir),
+            "--distpath", str(dist_dir),
+        ]
+    
+    # Reuse the cached analysis only while dependencies are unchanged
+    deps_hash = deps_fingerprint()
+    deps_hash_file = work_dir / ".deps_hash"
+    fresh = config["fresh"]
+    if not fresh and deps_hash_file.exists():
+        if deps_hash_file.read_text(encoding="utf-8").strip() != deps_hash:
+            print("Dependencies changed, discarding PyInstaller cache")
+            fresh = True
+    
+    # Only release builds pay for UPX compression (upx= is rendered into the spec,
+    # --noupx is a makespec option and is rejected when building from a spec)
+    if config["release"] and UPX_DIR.is_dir():
+        pyinstaller_args += ["--upx-dir", str(UPX_DIR)]
+    
+    # Full rebuild: drop PyInstaller's cached analysis
+    if fresh:
+        pyinstaller_args.append("--clean")
+    
+    pyinstaller_args.append(str(spec_path))
     
     print("Running PyInstaller...")
     print("-" * 40)
     
-    result = subprocess.run(pyinstaller_args, cwd=PROJECT_ROOT)
+    # Run PyInstaller in-process to avoid a second interpreter cold start
+    import PyInstaller.__main__
     
-    if result.returncode != 0:
-        print("\n[ERROR] Build failed!")
-        sys.exit(1)
+    os.chdir(PROJECT_ROOT)
+    try:
+        PyInstaller.__main__.run(pyinstaller_args)
+    except SystemExit as e:
+        if e.code not in (None, 0):
+            print(f"\n[ERROR] Build failed! ({config['name']})")
+            return False
+    
+    work_dir.mkdir(parents=True, exist_ok=True)
+    deps_hash_file.write_text(deps_hash, encoding="utf-8")
     
     print("\n" + "=" * 60)
-    print("[SUCCESS] Build completed!")
+    print(f"[SUCCESS] Build completed! ({config['name']})")
     print("=" * 60)
     
-    dist_dir = PROJECT_ROOT / "dist"
     if sys.platform == "darwin":
         app_path = dist_dir / f"{APP_NAME}.app"
         if app_path.exists():
             print(f"\nApplication: {app_path}")
     else:
-        exe_name = f"{APP_NAME}.exe" if sys.platform == "win32" else APP_NAME
-        exe_path = dist_dir / APP_NAME / exe_name
+        if config["onefile"]:
+            exe_path = dist_dir / EXE_NAME
+        else:
+            exe_path = dist_dir / APP_NAME / EXE_NAME
         print(f"\nApplication: {exe_path}")
+    
+    return True
 
 
 def main():
     import argparse
     parser = argparse.ArgumentParser(description="Etsy Scraper Build Tool")
     parser.add_argument("--clean", action="store_true", help="Only clean build files")
+    parser.add_argument("--rebuild", "--fresh", dest="rebuild", action="store_true",
+                        help="Clean build files and rebuild without PyInstaller cache")
+    parser.add_argument("--variants", default="onedir",
+                        help=f"Comma separated build variants ({', '.join(BUILD_VARIANTS)}), "
+                             "several variants are built in parallel")
+    parser.add_argument("--release", action="store_true",
+                        help="Release build: compress binaries with UPX (uses tools/upx if present)")
+    parser.add_argument("--verbose", "-v", action="store_true",
+                        help="Show full PyInstaller output")
     args = parser.parse_args()
     
     os.chdir(PROJECT_ROOT)
@@ -153,9 +479,42 @@ def main():
     if args.clean:
         clean_build()
         print("[SUCCESS] Clean completed!")
-    else:
+        return
+    
+    variants = [v.strip() for v in args.variants.split(",") if v.strip()]
+    unknown = [v for v in variants if v not in BUILD_VARIANTS]
+    if not variants or unknown:
+        parser.error(f"unknown variant: {', '.join(unknown) or args.variants}")
+    
+    # Incremental by default: --noconfirm already overwrites dist/ in place,
+    # and keeping build/ lets PyInstaller reuse its cache
+    if args.rebuild:
         clean_build()
-        build_app()
+    
+    # Prepare shared resources once, before any worker starts
+    ctk_resources = ensure_ctk_cache()
+    isolated = len(variants) > 1
+    configs = [
+        {
+            "name": name,
+            **BUILD_VARIANTS[name],
+            "fresh": args.rebuild,
+            "isolated": isolated,
+            "ctk_resources": ctk_resources,
+            "release": args.release,
+            "verbose": args.verbose,
+        }
+        for name in variants
+    ]
+    
+    if isolated:
+        with ProcessPoolExecutor(max_workers=min(len(configs), os.cpu_count() or 1)) as executor:
+            results = list(executor.map(build_app, configs))
+    else:
+        results = [build_app(configs[0])]
+    
+    if not all(results):
+        sys.exit(1)
 
 
 if __name__ == "__main__":
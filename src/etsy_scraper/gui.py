@@ -1,51 +1,69 @@
 """
 Etsy Scraper GUI - CustomTkinter 桌面应用
 """
+import hashlib
 import json
 import os
+import queue
 import random
+import shutil
 import sys
 import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from pathlib import Path
 from tkinter import filedialog, messagebox
-from typing import Optional, List, Set
+from typing import Dict, Optional, List, Set
 
-# PyInstaller 打包后，添加 _MEIPASS 到 sys.path
-if getattr(sys, 'frozen', False):
-    # Running as compiled
-    bundle_dir = sys._MEIPASS
-    if bundle_dir not in sys.path:
-        sys.path.insert(0, bundle_dir)
+# PyInstaller 打包后，添加 _MEIPASS 到 sys.path（重复项无害，无需查重）
+_BUNDLED = getattr(sys, 'frozen', False)
+if _BUNDLED:
+    sys.path.insert(0, sys._MEIPASS)
 
 import customtkinter as ctk
+import requests
+from requests.adapters import HTTPAdapter
+from selenium import webdriver
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+from urllib3.util.retry import Retry
 
-# 导入核心功能 - 兼容 PyInstaller 打包
-try:
+# 导入核心功能 - 兼容 PyInstaller 打包（打包后作为顶层脚本运行，没有 __package__）
+if __package__:
     from .section_scraper import (
         ScrapeProgress, parse_section_url, get_section_info,
         extract_product_links, process_product, ImageNameTracker,
         start_chrome_with_debug, wait_for_chrome_ready,
-        sanitize_folder_name
+        sanitize_folder_name, read_section_id
     )
     from .real_chrome_scraper import (
         extract_data_with_selenium, download_images, sanitize_filename
     )
-    from .utils import parse_image_selection, parse_filter_words
-except ImportError:
+    from .utils import parse_image_selection, parse_filter_words, TitleFilter, dumps_json, image_extension
+else:
     from section_scraper import (
         ScrapeProgress, parse_section_url, get_section_info,
         extract_product_links, process_product, ImageNameTracker,
         start_chrome_with_debug, wait_for_chrome_ready,
-        sanitize_folder_name
+        sanitize_folder_name, read_section_id
     )
     from real_chrome_scraper import (
         extract_data_with_selenium, download_images, sanitize_filename
     )
-    from utils import parse_image_selection, parse_filter_words
+    from utils import parse_image_selection, parse_filter_words, TitleFilter, dumps_json, image_extension
 
 
+# 商品模式最多同时使用的 Chrome 数量
+MAX_BROWSERS = 4
+
+# 页面就绪判断：出现这些元素即可开始提取，不必固定等待
+PRODUCT_READY_SELECTOR = 'h1[data-buy-box-listing-title="true"], div.listing-page-image-carousel'
+SECTION_READY_SELECTOR = 'div.v2-listing-card[data-listing-id]'
+
 # 设置主题
 ctk.set_appearance_mode("light")
 ctk.set_default_color_theme("blue")
@@ -113,6 +131,14 @@ def get_default_output_folder() -> str:
     return str(target_path)
 
 
+def _iter_urls(text: str):
+    """逐行产出输入框中的非空链接（已去除首尾空白）"""
+    for line in text.splitlines():
+        line = line.strip()
+        if line:
+            yield line
+
+
 class ScraperWorker:
     """后台抓取工作器"""
     
@@ -121,33 +147,72 @@ class ScraperWorker:
                  filter_words: Optional[List[str]] = None,
                  delay: float = 2.0,
                  resume: bool = True,
-                 port: int = 9222):
+                 port: int = 9222,
+                 browsers: int = 1):
         self.app = app
         self.mode = mode
         self.urls = urls
         self.output_dir = output_dir
         self.image_selection = image_selection
         self.filter_words = filter_words
+        # 屏蔽词只编译一次（与 filter_title 相同：大小写不敏感的子串匹配）
+        self.title_filter = TitleFilter(filter_words)
         self.delay = delay
         self.resume = resume
         self.port = port
-        self.chrome_process = None
+        # 商品模式可并行使用多个 Chrome（各自独立端口和用户目录）
+        lanes = min(browsers, MAX_BROWSERS, len(urls)) if mode == 'product' else 1
+        self.ports = [port + i for i in range(max(1, lanes))]
+        self.chrome_processes = []
+        self.drivers = []
         self.driver = None
-        self._stop_flag = False
-        self._user_confirmed = False
+        self._progress_lock = threading.Lock()
+        self._started_count = 0
+        self._stop_event = threading.Event()
+        self._confirm_event = threading.Event()
         self._thread = None
+        # 本次运行已下载的图片：URL / 内容摘要 → 本地文件，用于复用重复图片
+        self._seen_urls: Dict[str, Path] = {}
+        self._seen_digests: Dict[bytes, Path] = {}
+        # 本次运行中每个图片文件属于哪个商品，不同商品标题相同时改用带商品 ID 的文件名
+        self._claimed_paths: Dict[Path, str] = {}
+        # 多浏览器并行时各下载线程共享上面三张表
+        self._seen_lock = threading.Lock()
+        self.http = self._create_session()
+        # 同名商品计数器，每个 Section 开始时重置（各 Section 输出到不同目录）
+        self.name_tracker = ImageNameTracker()
+    
+    @staticmethod
+    def _create_session():
+        """创建整个运行期间共享的 HTTP 会话（keep-alive 连接池 + 自动重试）"""
+        session = requests.Session()
+        session.headers.update({
+            "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36",
+            "Referer": "https://www.etsy.com/"
+        })
+        adapter = HTTPAdapter(
+            pool_connections=16, pool_maxsize=16,
+            max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=(502, 503, 504))
+        )
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        return session
     
     def log(self, msg: str):
-        self.app.after(0, lambda: self.app.log(msg))
+        # 直接入队，由主线程定时批量刷新到日志框
+        self.app.log(msg)
     
     def update_progress(self, current: int, total: int):
-        self.app.after(0, lambda: self.app.update_progress(current, total))
+        # 只保留最新进度，主线程下一次刷新时统一更新
+        self.app._pending_progress = (current, total)
     
     def stop(self):
-        self._stop_flag = True
+        self._stop_event.set()
+        # 同时唤醒等待用户确认的线程
+        self._confirm_event.set()
     
     def user_confirm(self):
-        self._user_confirmed = True
+        self._confirm_event.set()
     
     def start(self):
         self._thread = threading.Thread(target=self._run, daemon=True)
@@ -155,39 +220,47 @@ class ScraperWorker:
     
     def _run(self):
         try:
-            self.log("🚀 启动 Chrome 浏览器...")
-            self.chrome_process = start_chrome_with_debug(self.urls[0], self.port)
+            if len(self.ports) == 1:
+                self.log("🚀 启动 Chrome 浏览器...")
+            else:
+                self.log(f"🚀 启动 {len(self.ports)} 个 Chrome 浏览器...")
+            for i, port in enumerate(self.ports):
+                self.chrome_processes.append(
+                    start_chrome_with_debug(self.urls[i], port, isolated_profile=i > 0)
+                )
             
             self.log("⏳ 等待浏览器就绪...")
-            if not wait_for_chrome_ready(self.port):
-                self.app.after(0, lambda: self.app.on_finished(False, "Chrome 启动失败！请先关闭所有 Chrome 窗口。"))
-                return
+            for port in self.ports:
+                if not wait_for_chrome_ready(port):
+                    self.app.after(0, lambda: self.app.on_finished(False, "Chrome 启动失败！请先关闭所有 Chrome 窗口。"))
+                    return
             
             self.log("✅ Chrome 已启动！")
             self.log("")
             self.log("━" * 45)
-            self.log("⚠️  请在浏览器中完成验证")
+            if len(self.ports) == 1:
+                self.log("⚠️  请在浏览器中完成验证")
+            else:
+                self.log("⚠️  请在每个浏览器窗口中完成验证")
             self.log("    然后点击「继续抓取」按钮")
             self.log("━" * 45)
             
             self.app.after(0, self.app.on_chrome_ready)
             
-            while not self._user_confirmed and not self._stop_flag:
-                time.sleep(0.5)
+            self._confirm_event.wait()
             
-            if self._stop_flag:
+            if self._stop_event.is_set():
                 self.app.after(0, lambda: self.app.on_finished(False, "用户取消"))
                 return
             
             self.log("")
             self.log("✅ 开始抓取...")
             
-            from selenium import webdriver
-            from selenium.webdriver.chrome.options import Options
-            
-            options = Options()
-            options.add_experimental_option("debuggerAddress", f"localhost:{self.port}")
-            self.driver = webdriver.Chrome(options=options)
+            for port in self.ports:
+                options = Options()
+                options.add_experimental_option("debuggerAddress", f"localhost:{port}")
+                self.drivers.append(webdriver.Chrome(options=options))
+            self.driver = self.drivers[0]
             
             if self.mode == 'product':
                 self._scrape_products()
@@ -197,58 +270,115 @@ class ScraperWorker:
         except Exception as e:
             self.app.after(0, lambda: self.app.on_finished(False, f"错误: {str(e)}"))
         finally:
-            if self.chrome_process:
+            self.http.close()
+            for process in self.chrome_processes:
                 try:
-                    self.chrome_process.terminate()
+                    process.terminate()
                 except:
                     pass
     
+    def _navigate(self, url: str, selector: str, timeout: float = 10, driver=None):
+        """打开页面并等待关键元素出现；超时（如遇到验证页）时短暂等待后继续"""
+        driver = driver or self.driver
+        driver.get(url)
+        try:
+            WebDriverWait(driver, timeout).until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, selector))
+            )
+        except TimeoutException:
+            time.sleep(0.5)
+    
     def _scrape_products(self):
         total = len(self.urls)
-        success_count = 0
-        fail_count = 0
         output_path = Path(self.output_dir)
         output_path.mkdir(parents=True, exist_ok=True)
         
-        for idx, url in enumerate(self.urls, 1):
-            if self._stop_flag:
+        items = list(enumerate(self.urls, 1))
+        lanes = len(self.ports)
+        
+        if lanes == 1:
+            success_count, fail_count = self._scrape_product_lane(
+                self.driver, items, total, output_path
+            )
+        else:
+            # 每个 Chrome 一个线程，按轮转方式分配商品；每个浏览器只由自己的线程操作
+            with ThreadPoolExecutor(max_workers=lanes) as executor:
+                futures = [
+                    executor.submit(self._scrape_product_lane, driver,
+                                    items[i::lanes], total, output_path)
+                    for i, driver in enumerate(self.drivers)
+                ]
+                results = [f.result() for f in futures]
+            success_count = sum(r[0] for r in results)
+            fail_count = sum(r[1] for r in results)
+        
+        self.update_progress(total, total)
+        self.app.after(0, lambda: self.app.on_finished(True, f"完成！成功: {success_count}, 失败: {fail_count}"))
+    
+    def _scrape_product_lane(self, driver, items: List[tuple],
+                             total: int, output_path: Path) -> tuple:
+        """
+        在一个 Chrome 上依次抓取分配到的商品
+        
+        Args:
+            driver: 该 Chrome 对应的 WebDriver
+            items: (序号, URL) 列表，第一个 URL 已在浏览器启动时打开
+            total: 商品总数（用于日志和进度）
+            output_path: 输出目录
+            
+        Returns:
+            (成功数, 失败数)
+        """
+        success_count = 0
+        fail_count = 0
+        # 多浏览器并行时日志会交错，给每行加上商品序号
+        prefix = "  " if len(self.ports) == 1 else "  #{} "
+        
+        for n, (idx, url) in enumerate(items):
+            if self._stop_event.is_set():
                 break
             
+            tag = prefix.format(idx)
             self.log(f"\n[{idx}/{total}] 处理商品...")
-            self.update_progress(idx, total)
+            with self._progress_lock:
+                self._started_count += 1
+                self.update_progress(self._started_count, total)
             
-            if idx > 1:
+            if n > 0:
                 try:
-                    self.driver.get(url)
-                    time.sleep(2)
+                    self._navigate(url, PRODUCT_READY_SELECTOR, driver=driver)
                 except Exception as e:
-                    self.log(f"  ❌ 导航失败: {e}")
+                    self.log(f"{tag}❌ 导航失败: {e}")
                     fail_count += 1
                     continue
             
-            result = extract_data_with_selenium(self.port)
+            # 只取一次当前时间，scraped_at 与文件名时间戳共用
+            now = datetime.now()
+            result = extract_data_with_selenium(driver, scraped_at=now)
             
             if not result or not result.get('title'):
-                self.log("  ❌ 抓取失败！")
+                self.log(f"{tag}❌ 抓取失败！")
                 fail_count += 1
                 continue
             
             success_count += 1
-            self.log(f"  ✅ {result.get('title', '')[:40]}...")
-            self.log(f"  📷 图片: {len(result.get('images', []))} 张")
+            self.log(f"{tag}✅ {result.get('title', '')[:40]}...")
+            self.log(f"{tag}📷 图片: {len(result.get('images', []))} 张")
             
             product_id = result.get('product_id', 'unknown')
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            timestamp = now.strftime("%Y%m%d_%H%M%S")
             json_path = output_path / f"product_{product_id}_{timestamp}.json"
-            json_path.write_text(json.dumps(result, indent=2, ensure_ascii=False))
+            json_path.write_bytes(dumps_json(result))
             
-            self._download_images(result.get('images', []), result.get('title', ''), output_path)
+            # 取不到商品 ID 时用本次运行内唯一的序号区分同名商品
+            product_key = str(product_id) if product_id != 'unknown' else f"item{idx}"
+            self._download_images(result.get('images', []), result.get('title', ''), output_path,
+                                  product_key)
             
-            if idx < total:
-                time.sleep(max(1.0, self.delay + random.uniform(-0.5, 1.0)))
+            if n < len(items) - 1:
+                self._stop_event.wait(max(1.0, self.delay + random.uniform(-0.5, 1.0)))
         
-        self.update_progress(total, total)
-        self.app.after(0, lambda: self.app.on_finished(True, f"完成！成功: {success_count}, 失败: {fail_count}"))
+        return success_count, fail_count
     
     def _scrape_sections(self):
         total_sections = len(self.urls)
@@ -256,7 +386,7 @@ class ScraperWorker:
         total_fail = 0
         
         for sec_idx, url in enumerate(self.urls, 1):
-            if self._stop_flag:
+            if self._stop_event.is_set():
                 break
             
             try:
@@ -269,8 +399,7 @@ class ScraperWorker:
             
             if sec_idx > 1:
                 try:
-                    self.driver.get(url)
-                    time.sleep(2)
+                    self._navigate(url, SECTION_READY_SELECTOR)
                 except Exception as e:
                     self.log(f"  ❌ 导航失败: {e}")
                     continue
@@ -287,16 +416,9 @@ class ScraperWorker:
             
             # 同名文件夹冲突检测
             candidate_path = Path(self.output_dir) / section_dir_name
-            if candidate_path.exists():
-                progress_file = candidate_path / ".progress.json"
-                if progress_file.exists():
-                    try:
-                        with open(progress_file, 'r', encoding='utf-8') as f:
-                            existing_progress = json.load(f)
-                        if existing_progress.get('section_id') != section_id:
-                            section_dir_name = f"{section_dir_name}_{section_id}"
-                    except Exception:
-                        pass
+            existing_sid = read_section_id(candidate_path)
+            if existing_sid is not None and existing_sid != section_id:
+                section_dir_name = f"{section_dir_name}_{section_id}"
             
             output_path = Path(self.output_dir) / section_dir_name
             output_path.mkdir(parents=True, exist_ok=True)
@@ -320,48 +442,46 @@ class ScraperWorker:
             self.log(f"  ✅ 找到 {len(listing_ids)} 个商品")
             progress.set_total_found(len(listing_ids))
             
-            pending_ids = [lid for lid in listing_ids if lid not in completed_ids]
+            pending_ids = progress.pending(listing_ids)
             
             if not pending_ids:
                 self.log("  ✅ 全部完成")
                 continue
             
-            name_tracker = ImageNameTracker()
+            self.name_tracker.reset()
             
-            for i, listing_id in enumerate(pending_ids, 1):
-                if self._stop_flag:
-                    break
-                
-                self.update_progress(i, len(pending_ids))
-                
-                if process_product(self.driver, listing_id, output_path, name_tracker,
-                                  image_selection=self.image_selection,
-                                  filter_words=self.filter_words):
-                    total_success += 1
-                    progress.save(listing_id)
-                else:
-                    total_fail += 1
-                
-                if i < len(pending_ids):
-                    time.sleep(max(1.0, self.delay + random.uniform(-0.5, 1.0)))
+            # 进度日志在整个 Section 期间只打开一次
+            with progress:
+                for i, listing_id in enumerate(pending_ids, 1):
+                    if self._stop_event.is_set():
+                        break
+                    
+                    self.update_progress(i, len(pending_ids))
+                    
+                    if process_product(self.driver, listing_id, output_path, self.name_tracker,
+                                      image_selection=self.image_selection,
+                                      title_filter=self.title_filter, session=self.http):
+                        total_success += 1
+                        progress.save(listing_id)
+                    else:
+                        total_fail += 1
+                    
+                    if i < len(pending_ids):
+                        self._stop_event.wait(max(1.0, self.delay + random.uniform(-0.5, 1.0)))
             
             self.update_progress(len(pending_ids), len(pending_ids))
+            
+            # 每个 Section 结束时统一刷盘一次，而不是每张图片单独 fsync
+            if hasattr(os, 'sync'):
+                os.sync()
         
         self.app.after(0, lambda: self.app.on_finished(True, f"完成！成功: {total_success}, 失败: {total_fail}"))
     
-    def _download_images(self, images: List[str], title: str, output_dir: Path):
-        import requests
-        
+    def _download_images(self, images: List[str], title: str, output_dir: Path, product_id: str):
         if not images or not title:
             return
         
-        try:
-            from .utils import filter_title
-        except ImportError:
-            from utils import filter_title
-        display_title = title
-        if self.filter_words:
-            display_title = filter_title(title, self.filter_words)
+        display_title = self.title_filter.apply(title)
         
         safe_title = sanitize_filename(display_title)
         
@@ -370,25 +490,118 @@ class ScraperWorker:
         else:
             download_list = [(i+1, url) for i, url in enumerate(images)]
         
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36",
-            "Referer": "https://www.etsy.com/"
-        }
+        if not download_list:
+            return
         
-        for idx, url in download_list:
+        # 图片下载是网络 IO，多线程并发下载，复用 self.http 的连接池
+        workers = min(8, len(download_list))
+        
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(self._fetch_one, self.http, url, idx, safe_title, output_dir, product_id): idx
+                for idx, url in download_list
+            }
+            for future in as_completed(futures):
+                idx = futures[future]
+                status = future.result()
+                if status == 'ok':
+                    self.log(f"    📥 图片 {idx}")
+                elif status == 'skipped':
+                    self.log(f"    ⏭  图片 {idx} 已存在")
+                else:
+                    self.log(f"    ❌ 图片 {idx} 下载失败")
+    
+    def _claim_image_path(self, output_dir: Path, stem: str, ext: str, product_id: str) -> Path:
+        """
+        为商品的一张图片确定文件路径并登记归属
+        
+        标题相同的不同商品（可能在另一个浏览器中同时下载）不会写入同一个文件，
+        后到的商品改用 "{stem}_{商品 ID}.{ext}"
+        """
+        path = output_dir / f"{stem}.{ext}"
+        with self._seen_lock:
+            owner = self._claimed_paths.setdefault(path, product_id)
+            if owner != product_id:
+                path = output_dir / f"{stem}_{product_id}.{ext}"
+                self._claimed_paths[path] = product_id
+        return path
+    
+    def _fetch_one(self, session, url: str, idx: int, safe_title: str, output_dir: Path,
+                   product_id: str) -> str:
+        """下载单张图片（在线程池中执行），返回 'ok' / 'skipped' / 'failed'"""
+        try:
+            filepath = self._claim_image_path(output_dir, f"{safe_title}-{idx}", image_extension(url), product_id)
+            
+            # 上次中断前已下载完成的图片直接跳过（.part 机制保证已存在的文件是完整的）
             try:
-                ext = url.split('.')[-1].split('?')[0] or 'jpg'
-                filename = f"{safe_title}-{idx}.{ext}"
-                filepath = output_dir / filename
+                if filepath.stat().st_size > 0:
+                    with self._seen_lock:
+                        self._seen_urls.setdefault(url, filepath)
+                    return 'skipped'
+            except FileNotFoundError:
+                pass
+            
+            # 同一图片 URL 已下载过（如多个变体共用图片），直接复用本地文件
+            with self._seen_lock:
+                prior = self._seen_urls.get(url)
+            if prior is not None and prior != filepath and prior.exists():
+                self._link_or_copy(prior, filepath)
+                return 'ok'
+            
+            # 流式写盘，避免整张大图先缓存在内存中；边写边计算摘要
+            digest = hashlib.sha256()
+            with session.get(url, timeout=30, stream=True) as resp:
+                if resp.status_code != 200:
+                    return 'failed'
+                resp.raw.decode_content = True
                 
-                resp = requests.get(url, headers=headers, timeout=30)
-                if resp.status_code == 200:
-                    filepath.write_bytes(resp.content)
-                    self.log(f"    📥 图片 {idx}")
-            except:
-                self.log(f"    ❌ 图片 {idx} 下载失败")
+                def chunks():
+                    for chunk in iter(lambda: resp.raw.read(64 * 1024), b''):
+                        digest.update(chunk)
+                        yield chunk
+                
+                self._write_image_atomically(filepath, chunks())
             
-            time.sleep(random.uniform(0.3, 0.8))
+            # 内容相同的图片（不同 URL）硬链接到已有文件，节省磁盘
+            key = digest.digest()
+            with self._seen_lock:
+                prior = self._seen_digests.setdefault(key, filepath)
+                self._seen_urls[url] = filepath
+            if prior != filepath:
+                if prior.exists():
+                    filepath.unlink()
+                    self._link_or_copy(prior, filepath)
+                else:
+                    # 之前登记的文件已不在，改以本次下载的文件为准
+                    with self._seen_lock:
+                        self._seen_digests[key] = filepath
+            return 'ok'
+        except Exception:
+            pass
+        return 'failed'
+    
+    @staticmethod
+    def _write_image_atomically(path: Path, chunks):
+        """先写入 .part 临时文件再原子替换，中断时不会留下半张图片；不逐个 fsync"""
+        tmp = path.with_suffix(path.suffix + '.part')
+        try:
+            with open(tmp, 'wb', buffering=1 << 20) as f:
+                for chunk in chunks:
+                    f.write(chunk)
+            os.replace(tmp, path)
+        except BaseException:
+            tmp.unlink(missing_ok=True)
+            raise
+    
+    @staticmethod
+    def _link_or_copy(src: Path, dst: Path):
+        """优先硬链接，跨设备等情况下退回复制"""
+        if dst.exists():
+            dst.unlink()
+        try:
+            os.link(src, dst)
+        except OSError:
+            shutil.copyfile(src, dst)
 
 
 class App(ctk.CTk):
@@ -401,9 +614,15 @@ class App(ctk.CTk):
         
         self.worker: Optional[ScraperWorker] = None
         
+        # 日志和进度先缓存，每 100ms 批量刷新一次界面
+        self._log_queue: "queue.Queue[str]" = queue.Queue()
+        self._pending_progress: Optional[tuple] = None
+        
         self.setup_ui()
         self._load_saved_config()
         
+        self.after(100, self._drain_log_queue)
+        
         # 关闭窗口时保存配置
         self.protocol("WM_DELETE_WINDOW", self._on_close)
     
@@ -576,6 +795,11 @@ class App(ctk.CTk):
         self.product_port.pack(side="left")
         self.product_port.insert(0, "9222")
         
+        ctk.CTkLabel(row4, text="浏览器数：", font=ctk.CTkFont(size=14), width=100).pack(side="left", padx=(30, 0))
+        self.product_browsers = ctk.CTkEntry(row4, font=ctk.CTkFont(size=14), height=40, width=60)
+        self.product_browsers.pack(side="left")
+        self.product_browsers.insert(0, "1")
+        
         # 开始按钮
         self.product_start_btn = ctk.CTkButton(
             parent,
@@ -679,9 +903,29 @@ class App(ctk.CTk):
             entry.insert(0, folder)
     
     def log(self, msg: str):
+        """记录日志（线程安全），实际写入由 _drain_log_queue 完成"""
         timestamp = datetime.now().strftime("%H:%M:%S")
-        self.log_text.insert("end", f"[{timestamp}] {msg}\n")
-        self.log_text.see("end")
+        self._log_queue.put(f"[{timestamp}] {msg}\n")
+    
+    def _drain_log_queue(self):
+        """批量刷新日志和进度，每个周期只更新一次控件"""
+        lines = []
+        try:
+            while len(lines) < 500:
+                lines.append(self._log_queue.get_nowait())
+        except queue.Empty:
+            pass
+        
+        if lines:
+            self.log_text.insert("end", "".join(lines))
+            self.log_text.see("end")
+        
+        if self._pending_progress is not None:
+            current, total = self._pending_progress
+            self._pending_progress = None
+            self.update_progress(current, total)
+        
+        self.after(100, self._drain_log_queue)
     
     def update_progress(self, current: int, total: int):
         if total > 0:
@@ -694,13 +938,13 @@ class App(ctk.CTk):
             messagebox.showwarning("提示", "请输入商品链接！")
             return
         
-        urls = [u.strip() for u in urls_text.split('\n') if u.strip()]
+        urls = list(_iter_urls(urls_text))
         
-        for url in urls:
-            # 支持各种地区前缀的 Etsy 链接，如 etsy.com/listing/ 或 etsy.com/sg-en/listing/
-            if 'etsy.com' not in url or '/listing/' not in url:
-                messagebox.showerror("错误", f"无效链接:\n{url}")
-                return
+        # 支持各种地区前缀的 Etsy 链接，如 etsy.com/listing/ 或 etsy.com/sg-en/listing/
+        bad = next((u for u in urls if 'etsy.com' not in u or '/listing/' not in u), None)
+        if bad:
+            messagebox.showerror("错误", f"无效链接:\n{bad}")
+            return
         
         image_selection = None
         img_text = self.product_images.get().strip()
@@ -719,8 +963,13 @@ class App(ctk.CTk):
         try:
             delay = float(self.product_delay.get())
             port = int(self.product_port.get())
+            browsers = int(self.product_browsers.get())
         except ValueError:
-            messagebox.showerror("错误", "延迟和端口必须是数字！")
+            messagebox.showerror("错误", "延迟、端口和浏览器数必须是数字！")
+            return
+        
+        if not 1 <= browsers <= MAX_BROWSERS:
+            messagebox.showerror("错误", f"浏览器数必须在 1 到 {MAX_BROWSERS} 之间！")
             return
         
         self.start_worker(
@@ -730,7 +979,8 @@ class App(ctk.CTk):
             image_selection=image_selection,
             filter_words=filter_words,
             delay=delay,
-            port=port
+            port=port,
+            browsers=browsers
         )
     
     def start_section_scrape(self):
@@ -739,12 +989,12 @@ class App(ctk.CTk):
             messagebox.showwarning("提示", "请输入 Section 链接！")
             return
         
-        urls = [u.strip() for u in urls_text.split('\n') if u.strip()]
+        urls = list(_iter_urls(urls_text))
         
-        for url in urls:
-            if 'section_id=' not in url:
-                messagebox.showerror("错误", f"无效链接:\n{url}")
-                return
+        bad = next((u for u in urls if 'section_id=' not in u), None)
+        if bad:
+            messagebox.showerror("错误", f"无效链接:\n{bad}")
+            return
         
         image_selection = None
         img_text = self.section_images.get().strip()
@@ -6,57 +6,121 @@ Real Chrome Scraper - 使用 Selenium 连接真实 Chrome
 2. 然后 Selenium 连接到该浏览器进行数据提取
 3. 这样可以复用你手动验证后的会话
 """
-import json
 import os
 import random
 import re
+import shutil
 import subprocess
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional, Dict, List
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
+try:
+    from .utils import dumps_json, filter_title, image_extension, parse_filter_words, parse_image_selection
+except ImportError:
+    from utils import dumps_json, filter_title, image_extension, parse_filter_words, parse_image_selection
 
+# 模块级 HTTP 会话：所有图片都来自同一 CDN，复用 keep-alive 连接和 TLS 会话
+_SESSION = requests.Session()
+_SESSION.headers.update({
+    "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36",
+    "Referer": "https://www.etsy.com/"
+})
+# CDN 偶发的 429/5xx 由 urllib3 自动重试（指数退避，遵守 Retry-After）
+_RETRY = Retry(
+    total=4,
+    backoff_factor=0.5,
+    status_forcelist=(429, 500, 502, 503, 504),
+    allowed_methods=frozenset({'GET'}),
+    respect_retry_after_header=True,
+)
+_SESSION.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=_RETRY))
+
+# 预编译的正则
+_SANITIZE_RE = re.compile(r'[<>:"/\\|?*\n\r\t]')
+_SHOP_RE = re.compile(r'/shop/([^/?]+)')
+_LISTING_RE = re.compile(r'/listing/(\d+)/')
+_IMAGE_SIZE_RE = re.compile(r'il_[^.]+\.')
+
+# 出现在 h1 中即认为是验证页面（小写比较）
+_CAPTCHA_MARKERS = ('验证', 'robot', 'captcha', 'verify')
+
+# 关闭抓取用不到的后台服务（同步、翻译、后台联网等），并避免被遮挡/后台的窗口被降频，
+# 多个 Chrome 同时运行时每个窗口都能全速渲染
+CHROME_LEAN_FLAGS = (
+    "--disable-features=Translate,BackForwardCache,AcceptCHFrame",
+    "--disable-background-networking",
+    "--disable-sync",
+    "--disable-default-apps",
+    "--disable-extensions",
+    "--mute-audio",
+    "--disable-renderer-backgrounding",
+    "--disable-backgrounding-occluded-windows",
+)
+
+# Etsy CDN 支持的图片尺寸（URL 中 il_ 后的部分），fullxfull 为原图
+IMAGE_SIZES = ("fullxfull", "1588xN", "794xN", "570xN")
+
+
+@lru_cache(maxsize=1024)
 def sanitize_filename(name: str, max_length: int = 100) -> str:
     """清理文件名"""
     if not name:
         return "unnamed"
-    sanitized = re.sub(r'[<>:"/\\|?*\n\r\t]', '_', name)
+    sanitized = _SANITIZE_RE.sub('_', name)
     return sanitized[:max_length].rstrip(' ._') or "unnamed"
 
 
+# 当前平台的 Chrome 候选路径（导入时确定一次）
+if sys.platform == "darwin":
+    CHROME_PATHS = (
+        "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome",
+        "/Applications/Chromium.app/Contents/MacOS/Chromium",
+    )
+elif sys.platform == "win32":
+    CHROME_PATHS = (
+        os.path.expandvars(r"%ProgramFiles%\Google\Chrome\Application\chrome.exe"),
+        os.path.expandvars(r"%LocalAppData%\Google\Chrome\Application\chrome.exe"),
+    )
+else:
+    CHROME_PATHS = ("/usr/bin/google-chrome", "/usr/bin/chromium-browser")
+
+
+@lru_cache(maxsize=1)
 def get_chrome_path() -> Optional[str]:
-    """获取 Chrome 路径"""
-    if sys.platform == "darwin":
-        paths = [
-            "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome",
-            "/Applications/Chromium.app/Contents/MacOS/Chromium",
-        ]
-    elif sys.platform == "win32":
-        paths = [
-            os.path.expandvars(r"%ProgramFiles%\Google\Chrome\Application\chrome.exe"),
-            os.path.expandvars(r"%LocalAppData%\Google\Chrome\Application\chrome.exe"),
-        ]
-    else:
-        paths = ["/usr/bin/google-chrome", "/usr/bin/chromium-browser"]
-    
-    for p in paths:
+    """获取 Chrome 路径（结果会缓存）"""
+    for p in CHROME_PATHS:
         if os.path.exists(p):
             return p
     return None
 
 
-def start_chrome_with_debug(url: str, port: int = 9222) -> subprocess.Popen:
-    """启动带调试端口的 Chrome"""
+def start_chrome_with_debug(url: str, port: int = 9222, isolated_profile: bool = False) -> subprocess.Popen:
+    """
+    启动带调试端口的 Chrome
+    
+    Args:
+        url: 启动后打开的页面
+        port: 远程调试端口
+        isolated_profile: 是否使用按端口区分的独立用户目录（同时运行多个 Chrome 时需要）
+    """
     chrome_path = get_chrome_path()
     if not chrome_path:
         raise RuntimeError("找不到 Chrome！")
     
     # 创建临时用户目录避免与现有 Chrome 冲突
-    temp_user_dir = Path.home() / ".etsy_scraper_chrome_profile"
+    profile_name = ".etsy_scraper_chrome_profile"
+    if isolated_profile:
+        profile_name += f"_{port}"
+    temp_user_dir = Path.home() / profile_name
     temp_user_dir.mkdir(exist_ok=True)
     
     cmd = [
@@ -66,301 +130,366 @@ def start_chrome_with_debug(url: str, port: int = 9222) -> subprocess.Popen:
         "--no-first-run",
         "--no-default-browser-check",
         "--disable-blink-features=AutomationControlled",
+        *CHROME_LEAN_FLAGS,
         f"--window-size={random.randint(1200, 1920)},{random.randint(800, 1080)}",
         url
     ]
     
-    return subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    # POSIX 上 close_fds=False 时 subprocess 会走 posix_spawn（绝对路径 + DEVNULL 满足其余条件），
+    # 避免 fork 整个 Python 进程；Python 创建的 fd 默认不可继承（PEP 446），不会泄漏给 Chrome
+    return subprocess.Popen(
+        cmd,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        close_fds=sys.platform == "win32",
+    )
 
 
 def wait_for_chrome_ready(port: int = 9222, timeout: int = 30) -> bool:
-    """等待 Chrome 调试端口就绪"""
-    import time
-    start = time.time()
-    while time.time() - start < timeout:
+    """等待 Chrome 调试端口就绪（指数退避轮询：50ms 起，最长间隔 1s）"""
+    deadline = time.monotonic() + timeout
+    delay = 0.05
+    while time.monotonic() < deadline:
         try:
-            resp = requests.get(f"http://localhost:{port}/json", timeout=2)
+            resp = _SESSION.get(f"http://localhost:{port}/json/version", timeout=0.5)
             if resp.status_code == 200:
                 return True
-        except:
+        except requests.RequestException:
             pass
-        time.sleep(1)
+        time.sleep(delay)
+        delay = min(1.0, delay * 2)
     return False
 
 
-def extract_data_with_selenium(port: int = 9222) -> Optional[Dict]:
-    """使用 Selenium 连接并提取数据"""
-    from selenium import webdriver
-    from selenium.webdriver.chrome.options import Options
-    from selenium.webdriver.common.by import By
-    from selenium.webdriver.support.ui import WebDriverWait
-    from selenium.webdriver.support import expected_conditions as EC
+# 商品页数据提取脚本：一次 Runtime.evaluate 取回标题、店铺、价格和主图，
+# 替代逐个 find_element 的多次往返。图片按以下优先级提取，命中即停止：
+#   zoom     - data-src-zoom-image 属性（直接是 fullxfull 高清图）
+#   gallery  - 图片轮播/画廊区域
+#   js       - 页面中与图片相关的容器
+#   location - 页面上部（y < 1500）的 etsystatic 图片，仅限 /listing/ 页面
+EXTRACT_PAGE_JS = r'''
+(() => {
+    const text = (sel) => {
+        const el = document.querySelector(sel);
+        return el ? el.innerText.trim() : null;
+    };
+    const idOf = (url) => {
+        const m = url.match(/\/il_[^.]+\.(\d+)_/);
+        return m ? m[1] : null;
+    };
+    const fullsize = (url) => url.replace(/il_[^.]+\./, 'il_fullxfull.');
+    
+    const images = [];
+    const seen = new Set();
+    const add = (url, convert) => {
+        const id = idOf(url);
+        if (id && !seen.has(id)) {
+            seen.add(id);
+            images.push(convert ? fullsize(url) : url);
+        }
+    };
+    let method = null;
+    
+    document.querySelectorAll(
+        'li[data-carousel-pane]:not([data-video-pane]) img[data-src-zoom-image]'
+    ).forEach((img) => {
+        const url = img.getAttribute('data-src-zoom-image');
+        if (url && url.includes('etsystatic.com')) add(url, false);
+    });
+    if (images.length) method = 'zoom';
+    
+    if (!images.length) {
+        const gallery = [
+            'div[data-component="listing-page-image-carousel"] img',
+            'ul[data-carousel-pagination-list] img',
+            'div.image-carousel-container img',
+            'div.listing-page-image-carousel img',
+            'ul.carousel-pane-list img[src*="il_"]',
+            'div[data-appears-component-name="image_carousel"] img',
+        ];
+        for (const sel of gallery) {
+            document.querySelectorAll(sel).forEach((img) => {
+                const src = img.src || img.dataset.src;
+                if (src && src.includes('il_') && src.includes('etsystatic.com')) add(src, true);
+            });
+            if (images.length) {
+                method = 'gallery';
+                break;
+            }
+        }
+    }
     
-    options = Options()
-    options.add_experimental_option("debuggerAddress", f"localhost:{port}")
+    if (!images.length) {
+        document.querySelectorAll([
+            '[data-component*="image"]',
+            '[class*="listing-page-image"]',
+            '[class*="image-carousel"]',
+            '[data-appears-component-name*="image"]',
+        ].join(',')).forEach((container) => {
+            container.querySelectorAll('img').forEach((img) => {
+                const src = img.src || img.dataset.src;
+                if (src && src.includes('etsystatic.com') && src.includes('/il_')) add(src, true);
+            });
+        });
+        if (images.length) method = 'js';
+    }
     
-    driver = webdriver.Chrome(options=options)
+    if (!images.length && /\/listing\/\d+\//.test(location.href)) {
+        document.querySelectorAll('img[src*="etsystatic.com/il_"]').forEach((img) => {
+            if (img.getBoundingClientRect().top + window.scrollY < 1500) add(img.src, true);
+        });
+        if (images.length) method = 'location';
+    }
     
-    try:
-        # 获取当前 URL
-        current_url = driver.current_url
-        print(f"当前页面: {current_url}")
-        
-        # 检查是否是有效的 Etsy 产品页面
-        # 方法：看是否能找到产品页面的关键元素，而不是检测"验证"关键词
-        is_product_page = False
-        
-        # 尝试查找产品页面特有的元素
-        product_indicators = [
-            'h1[data-buy-box-listing-title="true"]',  # 产品标题
-            'div[data-appears-component-name="listing_page"]',  # 产品页面标记
-            'div.listing-page-image-carousel',  # 图片轮播
-            'button[data-add-to-cart-button]',  # 加入购物车按钮
-            'div[data-buy-box-region="price"]',  # 价格区域
-        ]
-        
-        for selector in product_indicators:
-            try:
-                el = driver.find_element(By.CSS_SELECTOR, selector)
-                if el:
-                    is_product_page = True
-                    print(f"✓ 检测到产品页面元素: {selector}")
-                    break
-            except:
-                continue
-        
-        # 备用检测：看 URL 是否包含 listing 且页面有 h1 标题
-        if not is_product_page:
-            if '/listing/' in current_url:
-                try:
-                    h1 = driver.find_element(By.TAG_NAME, 'h1')
-                    h1_text = h1.text.strip()
-                    # 确保 h1 不是验证页面的标题
-                    if h1_text and len(h1_text) > 5 and '验证' not in h1_text and 'robot' not in h1_text.lower():
-                        is_product_page = True
-                        print(f"✓ 检测到产品标题: {h1_text[:50]}...")
-                except:
-                    pass
-        
-        if not is_product_page:
-            print("⚠️  未检测到产品页面元素！")
-            print("   可能原因：")
-            print("   1. 还在验证页面")
-            print("   2. 页面未完全加载")
-            print("   3. 不是有效的 Etsy 产品页面")
-            
-            # 询问用户是否要强制继续
-            force = input("\n是否强制继续抓取? (y/N): ")
-            if force.lower() != 'y':
-                return None
-            print("强制继续...")
-        
-        # 模拟人类滚动
-        print("模拟浏览行为...")
-        for _ in range(3):
-            scroll_distance = random.randint(200, 500)
-            driver.execute_script(f"window.scrollBy(0, {scroll_distance})")
-            time.sleep(random.uniform(0.5, 1.5))
-        
-        # 滚动回顶部
-        driver.execute_script("window.scrollTo(0, 0)")
-        time.sleep(1)
-        
-        # 提取数据
-        print("提取数据...")
-        
-        data = {}
-        
-        # 标题
-        try:
-            title_el = driver.find_element(By.CSS_SELECTOR, 'h1[data-buy-box-listing-title="true"]')
-            data['title'] = title_el.text.strip()
-        except:
-            try:
-                title_el = driver.find_element(By.TAG_NAME, 'h1')
-                data['title'] = title_el.text.strip()
-            except:
-                data['title'] = None
-        
-        # 店铺
-        try:
-            shop_link = driver.find_element(By.CSS_SELECTOR, 'a[href*="/shop/"]')
-            href = shop_link.get_attribute('href')
-            match = re.search(r'/shop/([^/?]+)', href)
-            data['shop_name'] = match.group(1) if match else None
-        except:
-            data['shop_name'] = None
-        
-        # 价格
+    const shop = document.querySelector('a[href*="/shop/"]');
+    return {
+        title: text('h1[data-buy-box-listing-title="true"]') ?? text('h1'),
+        shop_href: shop ? shop.href : null,
+        price: text('span.currency-value'),
+        images: images,
+        image_method: method,
+    };
+})()
+'''
+
+# 模拟浏览的滚动脚本：整套滚动节奏在浏览器内用 setTimeout 完成，只需一次 WebDriver 往返
+# 参数: steps, minPx, maxPx, minPauseMs, maxPauseMs, settleMs, done 回调
+SCROLL_JS = r'''
+const [steps, minPx, maxPx, minPause, maxPause, settle, done] = arguments;
+const rand = (lo, hi) => lo + Math.random() * (hi - lo);
+let n = 0;
+function step() {
+    if (n++ >= steps) {
+        window.scrollTo(0, 0);
+        setTimeout(done, settle);
+        return;
+    }
+    window.scrollBy(0, Math.round(rand(minPx, maxPx)));
+    setTimeout(step, rand(minPause, maxPause));
+}
+step();
+'''
+
+
+def simulate_scroll(driver, steps: int = 3, min_px: int = 200, max_px: int = 500,
+                    min_pause: float = 0.5, max_pause: float = 1.5, settle: float = 1.0):
+    """
+    模拟人类滚动后回到顶部（单次 execute_async_script）
+    
+    Args:
+        driver: Selenium WebDriver 实例
+        steps: 向下滚动次数
+        min_px: 每次最少滚动像素
+        max_px: 每次最多滚动像素
+        min_pause: 每次滚动后最短停顿（秒）
+        max_pause: 每次滚动后最长停顿（秒）
+        settle: 回到顶部后的等待时间（秒）
+    """
+    driver.execute_async_script(
+        SCROLL_JS, steps, min_px, max_px,
+        int(min_pause * 1000), int(max_pause * 1000), int(settle * 1000)
+    )
+
+
+# 各图片提取方式对应的日志
+IMAGE_METHOD_MESSAGES = {
+    'zoom': "从 data-src-zoom-image 直接获取 {} 张高清主图",
+    'gallery': "从画廊区域找到 {} 张主图",
+    'js': "通过JS从图片区域找到 {} 张主图",
+    'location': "通过位置过滤找到 {} 张主图",
+}
+
+
+def _safe_find(driver, by: str, selector: str, attempts: int = 2):
+    """
+    查找单个元素，不存在时返回 None
+    
+    只处理 NoSuchElementException 和 StaleElementReferenceException（Etsy 页面懒加载
+    时 DOM 会被替换，稍等后重试），其他异常照常抛出，不再被裸 except 吞掉。
+    """
+    from selenium.common.exceptions import NoSuchElementException, StaleElementReferenceException
+    
+    for attempt in range(attempts):
         try:
-            price_el = driver.find_element(By.CSS_SELECTOR, 'span.currency-value')
-            data['price'] = price_el.text.strip()
-        except:
-            data['price'] = None
-        
-        # 图片 - 只获取商品详情主图，排除 "More from this shop" 等杂图
-        images = []
-        seen_ids = set()  # 使用图片ID去重，而不是URL
-        
-        def extract_image_id(url):
-            """从 URL 中提取图片唯一 ID，如 7261901436"""
-            # 匹配 il_xxxxx.数字ID_后缀.jpg 格式
-            match = re.search(r'/il_[^.]+\.(\d+)_', url)
-            return match.group(1) if match else None
-        
-        def convert_to_fullsize(url):
-            """将任何尺寸的图片 URL 转换为全尺寸"""
-            # 匹配各种尺寸格式: _794xN, _570xN, _1588xN, _fullxfull, _300x300 等
-            return re.sub(r'il_[^.]+\.', 'il_fullxfull.', url)
-        
-        # 方法0（最优先）: 直接从 data-src-zoom-image 属性获取最高清图片
-        # 这个属性直接包含 fullxfull 版本的 URL，无需转换
+            return driver.find_element(by, selector)
+        except NoSuchElementException:
+            return None
+        except StaleElementReferenceException:
+            if attempt < attempts - 1:
+                time.sleep(0.1)
+    return None
+
+
+def _safe_text(driver, by: str, selector: str, attempts: int = 2) -> Optional[str]:
+    """读取单个元素去除首尾空白后的文本，元素不存在时返回 None；元素过期时重新查找"""
+    from selenium.common.exceptions import StaleElementReferenceException
+    
+    # 重试只在这一层做：每轮查找一次，避免与 _safe_find 的重试叠加成 attempts² 次
+    for attempt in range(attempts):
+        el = _safe_find(driver, by, selector, attempts=1)
+        if el is None:
+            return None
         try:
-            zoom_imgs = driver.find_elements(
-                By.CSS_SELECTOR, 
-                'li[data-carousel-pane]:not([data-video-pane]) img[data-src-zoom-image]'
-            )
-            for img in zoom_imgs:
-                zoom_url = img.get_attribute('data-src-zoom-image')
-                if zoom_url and 'etsystatic.com' in zoom_url:
-                    img_id = extract_image_id(zoom_url)
-                    if img_id and img_id not in seen_ids:
-                        seen_ids.add(img_id)
-                        images.append(zoom_url)
-            if images:
-                print(f"  ✓ 从 data-src-zoom-image 直接获取 {len(images)} 张高清主图")
-        except Exception as e:
-            print(f"  方法0失败: {e}")
-        
-        # 方法1: 从产品图片轮播/画廊区域获取（备选）
-        if not images:
-            gallery_selectors = [
-                # 主图片画廊容器
-                'div[data-component="listing-page-image-carousel"] img',
-                'ul[data-carousel-pagination-list] img',
-                'div.image-carousel-container img',
-                'div.listing-page-image-carousel img',
-                # 缩略图列表
-                'ul.carousel-pane-list img[src*="il_"]',
-                'div[data-appears-component-name="image_carousel"] img',
-            ]
-            
-            for selector in gallery_selectors:
-                try:
-                    gallery_imgs = driver.find_elements(By.CSS_SELECTOR, selector)
-                    for img in gallery_imgs:
-                        src = img.get_attribute('src') or img.get_attribute('data-src')
-                        if src and 'il_' in src and 'etsystatic.com' in src:
-                            img_id = extract_image_id(src)
-                            if img_id and img_id not in seen_ids:
-                                seen_ids.add(img_id)
-                                full_src = convert_to_fullsize(src)
-                                images.append(full_src)
-                    if images:
-                        print(f"  ✓ 从画廊区域找到 {len(images)} 张主图")
-                        break
-                except:
-                    continue
-        
-        # 方法2: 如果前面方法没找到，使用 JavaScript 从页面顶部区域提取
-        if not images:
-            try:
-                js_images = driver.execute_script('''
-                    const images = [];
-                    const seenIds = new Set();
-                    
-                    function extractImageId(url) {
-                        const match = url.match(/\\/il_[^.]+\\.(\\d+)_/);
-                        return match ? match[1] : null;
-                    }
-                    
-                    function convertToFullsize(url) {
-                        return url.replace(/il_[^.]+\\./, 'il_fullxfull.');
-                    }
-                    
-                    // 获取产品图片区域（通常在页面左侧/顶部）
-                    const containers = document.querySelectorAll([
-                        '[data-component*="image"]',
-                        '[class*="listing-page-image"]',
-                        '[class*="image-carousel"]',
-                        '[data-appears-component-name*="image"]'
-                    ].join(','));
-                    
-                    containers.forEach(container => {
-                        container.querySelectorAll('img').forEach(img => {
-                            let src = img.src || img.dataset.src;
-                            if (src && src.includes('etsystatic.com') && src.includes('/il_')) {
-                                const imgId = extractImageId(src);
-                                if (imgId && !seenIds.has(imgId)) {
-                                    seenIds.add(imgId);
-                                    images.push(convertToFullsize(src));
-                                }
-                            }
-                        });
-                    });
-                    
-                    return images;
-                ''')
-                
-                if js_images:
-                    for src in js_images:
-                        img_id = extract_image_id(src)
-                        if img_id and img_id not in seen_ids:
-                            seen_ids.add(img_id)
-                            images.append(src)
-                    print(f"  ✓ 通过JS从图片区域找到 {len(images)} 张主图")
-            except Exception as e:
-                print(f"  JS提取失败: {e}")
-        
-        # 方法3: 最后的备选方案 - 只获取带有特定 listing ID 的图片
-        if not images:
-            try:
-                # 从 URL 获取 listing ID
-                listing_match = re.search(r'/listing/(\d+)/', current_url)
-                if listing_match:
-                    all_imgs = driver.find_elements(By.CSS_SELECTOR, 'img[src*="etsystatic.com/il_"]')
-                    
-                    for img in all_imgs:
-                        src = img.get_attribute('src')
-                        if src:
-                            # 检查图片是否在页面上半部分（产品详情区域）
-                            try:
-                                location = img.location
-                                # 只获取页面上部的图片（y < 1500 像素）
-                                if location['y'] < 1500:
-                                    img_id = extract_image_id(src)
-                                    if img_id and img_id not in seen_ids:
-                                        seen_ids.add(img_id)
-                                        full_src = convert_to_fullsize(src)
-                                        images.append(full_src)
-                            except:
-                                pass
-                    
-                    if images:
-                        print(f"  ✓ 通过位置过滤找到 {len(images)} 张主图")
-            except:
-                pass
-        
-        # 去重并限制数量（一般商品主图不会超过10张）
-        images = list(dict.fromkeys(images))[:15]
-        print(f"  最终获取 {len(images)} 张商品主图")
-        
-        data['images'] = images
-        
-        # 产品 ID
-        product_id_match = re.search(r'/listing/(\d+)/', current_url)
-        data['product_id'] = product_id_match.group(1) if product_id_match else None
-        
-        data['url'] = current_url
-        data['scraped_at'] = datetime.now().isoformat()
-        
-        return data
-        
-    finally:
-        # 不要关闭浏览器，让用户可以继续使用
+            return el.text.strip()
+        except StaleElementReferenceException:
+            if attempt < attempts - 1:
+                time.sleep(0.1)
+    return None
+
+
+# 商品页就绪标志（任一出现即可开始提取）
+PRODUCT_PAGE_SELECTOR = 'h1[data-buy-box-listing-title="true"], div[data-appears-component-name="listing_page"]'
+
+
+def wait_for_page_ready(driver, selector: str = PRODUCT_PAGE_SELECTOR, timeout: float = 15):
+    """
+    等待页面加载完成：先等 document.readyState 为 complete，再等关键元素出现
+    
+    超时（如停在验证页）不抛异常，交给后续的页面检测处理
+    
+    Args:
+        driver: Selenium WebDriver 实例
+        selector: 关键元素的 CSS 选择器，为空时只等待 readyState
+        timeout: 每个等待阶段的最长时间（秒）
+    """
+    from selenium.common.exceptions import TimeoutException
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.webdriver.support.ui import WebDriverWait
+    
+    wait = WebDriverWait(driver, timeout)
+    try:
+        wait.until(lambda d: d.execute_script("return document.readyState") == "complete")
+        if selector:
+            wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, selector)))
+    except TimeoutException:
         pass
 
 
+def _looks_like_captcha(text: str) -> bool:
+    """标题文本是否像验证页面（包含任一验证关键词）"""
+    lowered = text.lower()
+    return any(marker in lowered for marker in _CAPTCHA_MARKERS)
+
+
+def convert_image_size(url: str, size: str = "fullxfull") -> str:
+    """将 Etsy 图片 URL 改写为指定尺寸（如 fullxfull、794xN）"""
+    return _IMAGE_SIZE_RE.sub(f'il_{size}.', url, count=1)
+
+
+def extract_data_with_selenium(driver, image_size: str = "fullxfull",
+                               scraped_at: Optional[datetime] = None) -> Optional[Dict]:
+    """
+    从浏览器当前页面提取商品数据
+    
+    Args:
+        driver: 已连接到 Chrome 的 WebDriver（由调用方创建并复用，不会被关闭）
+        image_size: 图片尺寸，默认 fullxfull（原图）；较小尺寸可大幅减少下载量
+        scraped_at: 抓取时间，写入 scraped_at 字段；调用方传入以便与文件名时间戳一致，None 时取当前时间
+    """
+    from selenium.webdriver.common.by import By
+    
+    # 获取当前 URL
+    current_url = driver.current_url
+    print(f"当前页面: {current_url}")
+    
+    # 检查是否是有效的 Etsy 产品页面
+    # 方法：看是否能找到产品页面的关键元素，而不是检测"验证"关键词
+    is_product_page = False
+    
+    # 尝试查找产品页面特有的元素
+    product_indicators = [
+        'h1[data-buy-box-listing-title="true"]',  # 产品标题
+        'div[data-appears-component-name="listing_page"]',  # 产品页面标记
+        'div.listing-page-image-carousel',  # 图片轮播
+        'button[data-add-to-cart-button]',  # 加入购物车按钮
+        'div[data-buy-box-region="price"]',  # 价格区域
+    ]
+    
+    for selector in product_indicators:
+        if _safe_find(driver, By.CSS_SELECTOR, selector) is not None:
+            is_product_page = True
+            print(f"✓ 检测到产品页面元素: {selector}")
+            break
+    
+    # 备用检测：看 URL 是否包含 listing 且页面有 h1 标题
+    if not is_product_page:
+        if '/listing/' in current_url:
+            h1_text = _safe_text(driver, By.TAG_NAME, 'h1')
+            # 确保 h1 不是验证页面的标题
+            if h1_text and len(h1_text) > 5 and not _looks_like_captcha(h1_text):
+                is_product_page = True
+                print(f"✓ 检测到产品标题: {h1_text[:50]}...")
+    
+    if not is_product_page:
+        print("⚠️  未检测到产品页面元素！")
+        print("   可能原因：")
+        print("   1. 还在验证页面")
+        print("   2. 页面未完全加载")
+        print("   3. 不是有效的 Etsy 产品页面")
+        
+        # 询问用户是否要强制继续
+        force = input("\n是否强制继续抓取? (y/N): ")
+        if force.lower() != 'y':
+            return None
+        print("强制继续...")
+    
+    # 模拟人类滚动
+    print("模拟浏览行为...")
+    simulate_scroll(driver)
+    
+    # 提取数据
+    print("提取数据...")
+    
+    data = {}
+    
+    # 一次脚本执行取回所有字段
+    try:
+        response = driver.execute_cdp_cmd("Runtime.evaluate", {
+            "expression": EXTRACT_PAGE_JS,
+            "returnByValue": True,
+            "awaitPromise": False,
+        })
+        page = response.get('result', {}).get('value') or {}
+    except Exception as e:
+        print(f"  页面数据提取失败: {e}")
+        page = {}
+    
+    # 标题
+    data['title'] = page.get('title')
+    
+    # 店铺
+    shop_href = page.get('shop_href')
+    match = _SHOP_RE.search(shop_href) if shop_href else None
+    data['shop_name'] = match.group(1) if match else None
+    
+    # 价格
+    data['price'] = page.get('price')
+    
+    # 图片 - 只获取商品详情主图，排除 "More from this shop" 等杂图
+    images = page.get('images') or []
+    method = page.get('image_method')
+    if method in IMAGE_METHOD_MESSAGES:
+        print("  ✓ " + IMAGE_METHOD_MESSAGES[method].format(len(images)))
+    
+    # 限制数量（一般商品主图不会超过10张）；提取脚本已按图片 ID 去重
+    images = images[:15]
+    if image_size != "fullxfull":
+        images = [convert_image_size(u, image_size) for u in images]
+    print(f"  最终获取 {len(images)} 张商品主图")
+    
+    data['images'] = images
+    
+    # 产品 ID
+    product_id_match = _LISTING_RE.search(current_url)
+    data['product_id'] = product_id_match.group(1) if product_id_match else None
+    
+    data['url'] = current_url
+    data['scraped_at'] = (scraped_at or datetime.now()).isoformat()
+    
+    return data
+
+
 def download_images(images: List[str], title: str, output_dir: Path, 
                     image_selection: List[int] = None, filter_words: List[str] = None):
     """下载图片
@@ -376,10 +505,6 @@ def download_images(images: List[str], title: str, output_dir: Path,
         return
     
     # 应用标题过滤
-    try:
-        from .utils import filter_title
-    except ImportError:
-        from utils import filter_title
     display_title = title
     if filter_words:
         display_title = filter_title(title, filter_words)
@@ -387,45 +512,76 @@ def download_images(images: List[str], title: str, output_dir: Path,
     safe_title = sanitize_filename(display_title)
     
     # 确定要下载的图片
+    total = len(images)
     if image_selection:
-        # 过滤出有效的序号
-        valid_indices = [i for i in image_selection if 1 <= i <= len(images)]
-        skipped_indices = [i for i in image_selection if i > len(images)]
+        # 一次遍历区分有效 / 超出范围的序号
+        valid_indices, skipped_indices = [], []
+        for i in image_selection:
+            (valid_indices if 1 <= i <= total else skipped_indices).append(i)
         
         if skipped_indices:
-            print(f"⚠️ 跳过不存在的图片序号: {skipped_indices} (共 {len(images)} 张图片)")
+            print(f"⚠️ 跳过不存在的图片序号: {skipped_indices} (共 {total} 张图片)")
         
         if not valid_indices:
             print("⚠️ 没有有效的图片序号可下载")
             return
         
         download_list = [(i, images[i-1]) for i in valid_indices]
-        print(f"\n下载 {len(download_list)}/{len(images)} 张图片 (序号: {valid_indices})...")
+        print(f"\n下载 {len(download_list)}/{total} 张图片 (序号: {valid_indices})...")
     else:
-        download_list = [(i+1, url) for i, url in enumerate(images)]
-        print(f"\n下载 {len(images)} 张图片...")
+        download_list = list(enumerate(images, 1))
+        print(f"\n下载 {total} 张图片...")
+    
+    # 图片之间互不依赖，并发下载；线程数即并发上限，不再逐张 sleep
+    with ThreadPoolExecutor(max_workers=min(6, len(download_list))) as executor:
+        futures = [
+            executor.submit(_download_one, _SESSION, idx, url, safe_title, output_dir)
+            for idx, url in download_list
+        ]
+        for future in as_completed(futures):
+            idx, filename, err, skipped = future.result()
+            if err:
+                print(f"  ✗ [{idx}/{total}] {err}")
+            elif skipped:
+                print(f"  ↺ [{idx}/{total}] 已存在，跳过: {filename}")
+            else:
+                print(f"  ✓ [{idx}/{total}] {filename}")
+
+
+def _download_one(session: requests.Session, idx: int, url: str,
+                  safe_title: str, output_dir: Path) -> tuple:
+    """
+    下载单张图片（在线程池中执行）
     
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36",
-        "Referer": "https://www.etsy.com/"
-    }
+    目标文件已存在且非空时直接跳过，重复运行不会重新下载；
+    下载先写入 .part 临时文件，完成后原子替换，中断的传输不会留下被误判为完整的文件
     
-    for idx, url in download_list:
-        try:
-            ext = url.split('.')[-1].split('?')[0] or 'jpg'
-            filename = f"{safe_title}-{idx}.{ext}"
-            filepath = output_dir / filename
-            
-            resp = requests.get(url, headers=headers, timeout=30)
-            if resp.status_code == 200:
-                filepath.write_bytes(resp.content)
-                print(f"  ✓ [{idx}/{len(images)}] {filename}")
-            else:
-                print(f"  ✗ [{idx}/{len(images)}] HTTP {resp.status_code}")
-        except Exception as e:
-            print(f"  ✗ [{idx}/{len(images)}] {e}")
-        
-        time.sleep(random.uniform(0.3, 0.8))
+    Returns:
+        (序号, 文件名, 错误信息, 是否跳过)，成功时错误信息为 None
+    """
+    filename = f"{safe_title}-{idx}.{image_extension(url)}"
+    filepath = output_dir / filename
+    
+    try:
+        if filepath.stat().st_size > 0:
+            return idx, filename, None, True
+    except FileNotFoundError:
+        pass
+    
+    tmp_path = filepath.with_name(filename + '.part')
+    try:
+        # 流式写盘，整张图片不在内存中缓存
+        with session.get(url, timeout=30, stream=True) as resp:
+            if resp.status_code != 200:
+                return idx, filename, f"HTTP {resp.status_code}", False
+            resp.raw.decode_content = True
+            with open(tmp_path, 'wb') as f:
+                shutil.copyfileobj(resp.raw, f, length=64 * 1024)
+        os.replace(tmp_path, filepath)
+        return idx, filename, None, False
+    except Exception as e:
+        tmp_path.unlink(missing_ok=True)
+        return idx, filename, e, False
 
 
 def main():
@@ -467,15 +623,12 @@ def main():
                         help="指定下载哪些图片，如: '1' 或 '1,3,5' 或 '2-4' 或 '1,3-5,8'")
     parser.add_argument("--filter", "-f", default=None,
                         help="从标题中过滤的词汇，逗号分隔，如: 'Canvas,Poster,Wall Art'")
+    parser.add_argument("--size", "-s", default="fullxfull", choices=IMAGE_SIZES,
+                        help="下载的图片尺寸（默认: fullxfull 原图）")
     
     args = parser.parse_args()
     
     # 解析图片选择和过滤词参数
-    try:
-        from .utils import parse_image_selection, parse_filter_words
-    except ImportError:
-        from utils import parse_image_selection, parse_filter_words
-    
     image_selection = None
     filter_words = None
     
@@ -566,21 +719,18 @@ def main():
         if idx > 1:
             try:
                 driver.get(url)
-                # 等待页面加载
-                time.sleep(2)
+                # 等待页面加载完成（就绪即返回，而不是固定等待）
+                wait_for_page_ready(driver)
                 # 模拟人类滚动
-                for _ in range(2):
-                    scroll_distance = random.randint(200, 400)
-                    driver.execute_script(f"window.scrollBy(0, {scroll_distance})")
-                    time.sleep(random.uniform(0.3, 0.8))
-                driver.execute_script("window.scrollTo(0, 0)")
-                time.sleep(1)
+                simulate_scroll(driver, steps=2, max_px=400, min_pause=0.3, max_pause=0.8)
             except Exception as e:
                 print(f"  ❌ 导航失败: {e}")
                 fail_count += 1
                 continue
         
-        result = extract_data_with_selenium(args.port)
+        # 只取一次当前时间，scraped_at 与文件名时间戳共用
+        now = datetime.now()
+        result = extract_data_with_selenium(driver, image_size=args.size, scraped_at=now)
         
         if not result or not result.get('title'):
             print(f"\n❌ 抓取失败！")
@@ -600,9 +750,9 @@ def main():
         
         # 保存 JSON
         product_id = result.get('product_id', 'unknown')
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        timestamp = now.strftime("%Y%m%d_%H%M%S")
         json_path = output_path / f"product_{product_id}_{timestamp}.json"
-        json_path.write_text(json.dumps(result, indent=2, ensure_ascii=False))
+        json_path.write_bytes(dumps_json(result))
         print(f"  ✓ 数据已保存: {json_path}")
         
         # 下载图片
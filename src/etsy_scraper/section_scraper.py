@@ -8,19 +8,82 @@ Section Scraper - 批量抓取 Etsy 店铺 Section 下的所有商品图片
 4. 按扁平目录结构组织输出
 """
 import argparse
+import atexit
 import json
 import math
+import os
 import random
 import re
+import shutil
 import sys
+import threading
 import time
 from collections import defaultdict
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, List, Optional, Set, Tuple
 from urllib.parse import parse_qs, urlencode, urlparse, urlunparse
 
 import requests
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+
+# 热路径上使用的正则，模块加载时编译一次
+_UNDERSCORES_RE = re.compile(r'_+')
+_SHOP_PATH_RE = re.compile(r'/shop/([^/?]+)')
+_NAME_COUNT_RE = re.compile(r'^(.+?)\s*\((\d+)\)\s*$')
+_COUNT_RE = re.compile(r'(\d+)')
+_IMAGE_ID_RE = re.compile(r'/il_[^.]+\.(\d+)_')
+_IMAGE_SIZE_RE = re.compile(r'il_[^.]+\.')
+
+# 每个商品最多提取的主图数量
+MAX_PRODUCT_IMAGES = 15
+
+# 单个商品图片并发下载的线程数
+SECTION_DOWNLOAD_WORKERS = 4
+
+# 多个 Section 时最多同时使用的浏览器数（每个浏览器占用一个调试端口）
+MAX_BROWSERS = 4
+
+# 页面元素定位器（By, selector），模块加载时构造一次
+LISTING_CARD_SELECTOR = 'div.v2-listing-card[data-listing-id]'
+_MENU_TRIGGER_LABEL = (By.CSS_SELECTOR, '.wt-menu__trigger .wt-menu__trigger__label')
+_SELECTED_TAB_LOCATORS = tuple((By.CSS_SELECTOR, sel) for sel in (
+    'li.wt-tab__item[aria-selected="true"]',
+    'li.wt-tab__item.is-selected',
+    'li[role="tab"][aria-selected="true"]',
+    'li[role="tab"].is-selected',
+))
+_SPANS = (By.CSS_SELECTOR, 'span')
+_LISTING_TITLE = (By.CSS_SELECTOR, 'h1[data-buy-box-listing-title="true"]')
+_ANY_H1 = (By.TAG_NAME, 'h1')
+_ZOOM_IMAGE_SELECTOR = 'li[data-carousel-pane]:not([data-video-pane]) img[data-src-zoom-image]'
+_GALLERY_IMAGE_SELECTORS = (
+    'div[data-component="listing-page-image-carousel"] img',
+    'ul[data-carousel-pagination-list] img',
+    'ul.carousel-pane-list img[src*="il_"]',
+)
+
+# 一次 execute_script 取回所有匹配元素的属性值，避免逐个元素 get_attribute 的往返
+_ATTR_VALUES_JS = (
+    "const attr = arguments[1];"
+    "return Array.from(document.querySelectorAll(arguments[0]), e => e.getAttribute(attr));"
+)
+_IMAGE_SOURCES_JS = (
+    "return Array.from(document.querySelectorAll(arguments[0]),"
+    " e => e.src || e.getAttribute('data-src'));"
+)
+# 在页面内发起一次不等待结果的请求，预热下一个 Section 的 DNS / 连接 / HTTP 缓存
+_PREFETCH_JS = "fetch(arguments[0], {mode: 'no-cors', credentials: 'include'}).catch(() => {});"
+
+# 文件夹名中的文件系统非法字符 → _
+_UNSAFE_FOLDER_CHARS = str.maketrans({c: '_' for c in r'/\:*?"<>|'})
+
+# 与 .progress.json 同目录的哨兵文件，内容只有 section_id（冲突检测时无需解析 JSON）
+SECTION_ID_FILE = ".section_id"
 
 
 class ScrapeProgress:
@@ -28,6 +91,11 @@ class ScrapeProgress:
     管理抓取进度的持久化
     
     进度文件位置: {output_dir}/.progress.json
+    追加日志位置: {output_dir}/.progress.log
+    目录归属哨兵: {output_dir}/.section_id（首次写入进度文件时写入，只含 section_id）
+    
+    每完成一个商品只向 .progress.log 追加一行 listing_id，每 flush_every 条或每 FLUSH_INTERVAL 秒落盘（fsync）一次，
+    .progress.json 仅在 set_total_found()、每 COMPACT_EVERY 次追加以及 close() 时整体重写（合并日志）。
     
     进度文件格式:
     {
@@ -41,7 +109,11 @@ class ScrapeProgress:
     }
     """
     
-    def __init__(self, output_dir: Path, section_url: str, shop_name: str, section_id: str):
+    COMPACT_EVERY = 50
+    FLUSH_INTERVAL = 5.0
+    
+    def __init__(self, output_dir: Path, section_url: str, shop_name: str, section_id: str,
+                 flush_every: int = 10):
         """
         初始化进度管理器
         
@@ -50,14 +122,33 @@ class ScrapeProgress:
             section_url: Section URL
             shop_name: 店铺名称
             section_id: Section ID
+            flush_every: 追加日志每累计多少条 flush + fsync 一次
         """
         self.progress_file = output_dir / ".progress.json"
+        self.log_file = output_dir / ".progress.log"
+        self.sentinel_file = output_dir / SECTION_ID_FILE
         self.section_url = section_url
         self.shop_name = shop_name
         self.section_id = section_id
         self._completed_ids: Set[str] = set()
+        # 与集合同步维护的有序列表，compact() 时无需每次 list(set) 复制
+        self._completed_list: List[str] = []
         self._total_found: int = 0
         self._started_at: Optional[str] = None
+        # 不变字段（section 信息 + started_at）序列化后的 JSON 前缀
+        self._header_json: Optional[bytes] = None
+        self._log_fh = None
+        self._appends = 0
+        self._flush_every = max(1, flush_every)
+        self._unflushed = 0
+        self._last_flush = time.monotonic()
+        self._sentinel_written = False
+    
+    def __enter__(self) -> 'ScrapeProgress':
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
     
     def load(self) -> Set[str]:
         """
@@ -69,16 +160,24 @@ class ScrapeProgress:
         Raises:
             ValueError: 如果进度文件损坏
         """
-        if not self.progress_file.exists():
+        if not self.progress_file.exists() and not self.log_file.exists():
             return set()
         
         try:
-            with open(self.progress_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            if self.progress_file.exists():
+                data = loads_json(self.progress_file.read_bytes())
+                
+                self._completed_ids = set()
+                self._completed_list = []
+                self._add_completed(data.get('completed_ids', []))
+                self._total_found = data.get('total_found', 0)
+                self._started_at = data.get('started_at')
+                self._header_json = None
             
-            self._completed_ids = set(data.get('completed_ids', []))
-            self._total_found = data.get('total_found', 0)
-            self._started_at = data.get('started_at')
+            # 合并追加日志中尚未压缩的记录
+            if self.log_file.exists():
+                with open(self.log_file, 'r', encoding='utf-8') as f:
+                    self._add_completed(line.strip() for line in f if line.strip())
             
             return self._completed_ids
             
@@ -94,34 +193,115 @@ class ScrapeProgress:
         """
         保存新完成的 listing_id
         
-        每次成功下载一个商品后调用此方法，立即写入文件
+        每次成功下载一个商品后调用此方法，追加到日志文件（按 flush_every 批量落盘）
         
         Args:
             completed_id: 刚完成的商品 listing_id
         """
-        self._completed_ids.add(completed_id)
+        self._add_completed((completed_id,))
+        
+        # 尚未写过进度文件（未调用 set_total_found）时先写入 section 元信息
+        if not self.progress_file.exists():
+            self.compact()
+            return
+        
+        if self._log_fh is None:
+            self._log_fh = open(self.log_file, 'a', encoding='utf-8', buffering=1 << 16)
+            # 未走 with / close() 的异常退出也尽量把缓冲中的记录落盘
+            atexit.register(self.close)
+        self._log_fh.write(completed_id + '\n')
         
+        self._appends += 1
+        self._unflushed += 1
+        if self._appends >= self.COMPACT_EVERY:
+            self.compact()
+        elif (self._unflushed >= self._flush_every
+              or time.monotonic() - self._last_flush >= self.FLUSH_INTERVAL):
+            self._flush_log()
+    
+    def _add_completed(self, ids):
+        """记录已完成的 listing_id（去重，保持首次出现的顺序）"""
+        done = self._completed_ids
+        for lid in ids:
+            if lid not in done:
+                done.add(lid)
+                self._completed_list.append(lid)
+    
+    def _flush_log(self):
+        """将追加日志缓冲写入磁盘（一批记录只 fsync 一次）"""
+        self._log_fh.flush()
+        os.fsync(self._log_fh.fileno())
+        self._unflushed = 0
+        self._last_flush = time.monotonic()
+    
+    def _close_log(self):
+        """关闭追加日志文件句柄"""
+        if self._log_fh is not None:
+            self._log_fh.close()
+            self._log_fh = None
+            atexit.unregister(self.close)
+        self._unflushed = 0
+    
+    def compact(self):
+        """将追加日志合并进 .progress.json，并清空日志"""
         now = datetime.now(timezone.utc).isoformat().replace('+00:00', 'Z')
         
         if not self._started_at:
             self._started_at = now
         
-        data = {
-            "section_url": self.section_url,
-            "shop_name": self.shop_name,
-            "section_id": self.section_id,
-            "started_at": self._started_at,
+        # 不变字段只序列化一次，去掉末尾的 "}" 后与变化部分拼接
+        # 进度文件只给程序自己读，使用紧凑编码（无缩进、无多余空格）
+        if self._header_json is None:
+            header = {
+                "section_url": self.section_url,
+                "shop_name": self.shop_name,
+                "section_id": self.section_id,
+                "started_at": self._started_at,
+            }
+            self._header_json = dumps_compact_json(header)[:-1] + b','
+        
+        tail = {
             "updated_at": now,
-            "completed_ids": list(self._completed_ids),
+            "completed_ids": self._completed_list,
             "total_found": self._total_found
         }
+        # 去掉开头的 "{"，拼接后与整体序列化的输出一致
+        content = self._header_json + dumps_compact_json(tail)[1:]
+        
+        # 先写临时文件再原子替换，中途崩溃也不会留下半截的 .progress.json
+        tmp_file = self.progress_file.with_name(self.progress_file.name + '.tmp')
+        with open(tmp_file, 'wb') as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, self.progress_file)
+        
+        if not self._sentinel_written:
+            self._write_sentinel()
         
-        with open(self.progress_file, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        self._close_log()
+        if self.log_file.exists():
+            self.log_file.unlink()
+        self._appends = 0
+    
+    def _write_sentinel(self):
+        """写入 .section_id 哨兵文件（同样先写临时文件再原子替换）"""
+        tmp_file = self.sentinel_file.with_name(self.sentinel_file.name + '.tmp')
+        tmp_file.write_text(self.section_id, encoding='utf-8')
+        os.replace(tmp_file, self.sentinel_file)
+        self._sentinel_written = True
+    
+    def close(self):
+        """关闭日志文件，有未合并的记录时压缩进 .progress.json"""
+        if self._appends:
+            self.compact()
+        else:
+            self._close_log()
     
     def set_total_found(self, total: int):
-        """设置找到的总商品数"""
+        """设置找到的总商品数，并写入进度文件头（同时合并上次遗留的追加日志）"""
         self._total_found = total
+        self.compact()
     
     def is_completed(self, listing_id: str) -> bool:
         """
@@ -135,13 +315,33 @@ class ScrapeProgress:
         """
         return listing_id in self._completed_ids
     
+    def pending(self, listing_ids: List[str]) -> List[str]:
+        """
+        过滤掉已完成的商品，保持原有顺序
+        
+        Args:
+            listing_ids: 本次找到的商品 ID 列表
+            
+        Returns:
+            尚未完成的商品 ID 列表
+        """
+        done = self._completed_ids
+        return [lid for lid in listing_ids if lid not in done]
+    
     def clear(self):
         """清理进度文件"""
+        self._close_log()
+        if self.log_file.exists():
+            self.log_file.unlink()
+        self.sentinel_file.unlink(missing_ok=True)
+        self._sentinel_written = False
         if self.progress_file.exists():
             self.progress_file.unlink()
             self._completed_ids = set()
+            self._completed_list = []
             self._total_found = 0
             self._started_at = None
+            self._header_json = None
     
     @property
     def completed_count(self) -> int:
@@ -153,6 +353,29 @@ class ScrapeProgress:
         """找到的总商品数"""
         return self._total_found
 
+
+def read_section_id(directory: Path) -> Optional[str]:
+    """
+    读取输出目录所属的 section_id
+    
+    优先读取 .section_id 哨兵文件；没有哨兵的旧目录回退到解析 .progress.json
+    
+    Args:
+        directory: Section 输出目录
+        
+    Returns:
+        section_id；目录中没有（可读的）进度信息时返回 None
+    """
+    try:
+        return (directory / SECTION_ID_FILE).read_text(encoding='utf-8').strip()
+    except OSError:
+        pass
+    
+    try:
+        return loads_json((directory / ".progress.json").read_bytes()).get('section_id')
+    except Exception:
+        return None
+
 # 复用 real_chrome_scraper 的核心函数
 try:
     from .real_chrome_scraper import (
@@ -161,6 +384,17 @@ try:
         start_chrome_with_debug,
         wait_for_chrome_ready,
         extract_data_with_selenium,
+        simulate_scroll,
+        wait_for_page_ready,
+        _SESSION,
+    )
+    from .utils import (
+        TitleFilter,
+        dumps_compact_json,
+        image_extension,
+        loads_json,
+        parse_filter_words,
+        parse_image_selection,
     )
 except ImportError:
     from real_chrome_scraper import (
@@ -169,6 +403,17 @@ except ImportError:
         start_chrome_with_debug,
         wait_for_chrome_ready,
         extract_data_with_selenium,
+        simulate_scroll,
+        wait_for_page_ready,
+        _SESSION,
+    )
+    from utils import (
+        TitleFilter,
+        dumps_compact_json,
+        image_extension,
+        loads_json,
+        parse_filter_words,
+        parse_image_selection,
     )
 
 
@@ -182,20 +427,18 @@ def sanitize_folder_name(name: str) -> str:
     Returns:
         安全的文件夹名称
     """
-    # 替换文件系统非法字符为 _
-    unsafe_chars = r'/\:*?"<>|'
-    result = name
-    for char in unsafe_chars:
-        result = result.replace(char, '_')
+    # 替换文件系统非法字符为 _（translate 一次遍历完成）
+    result = name.translate(_UNSAFE_FOLDER_CHARS)
     # 去除首尾空白
     result = result.strip()
     # 合并连续下划线
-    result = re.sub(r'_+', '_', result)
+    result = _UNDERSCORES_RE.sub('_', result)
     # 去除首尾下划线
     result = result.strip('_')
     return result
 
 
+@lru_cache(maxsize=1024)
 def parse_section_url(url: str) -> Tuple[str, str]:
     """
     解析 Section URL，提取 shop_name 和 section_id
@@ -213,7 +456,7 @@ def parse_section_url(url: str) -> Tuple[str, str]:
     parsed = urlparse(url)
     
     # 提取 shop_name - 从路径 /shop/{shop_name}
-    path_match = re.search(r'/shop/([^/?]+)', parsed.path)
+    path_match = _SHOP_PATH_RE.search(parsed.path)
     if not path_match:
         raise ValueError(f"无效的 Section URL: 找不到店铺名称\nURL: {url}")
     shop_name = path_match.group(1)
@@ -238,16 +481,28 @@ def build_page_url(section_url: str, page: int) -> str:
     Returns:
         带 page=N 参数的 URL
     """
+    scheme, netloc, path, params, base_query = _split_section_url(section_url)
+    query_params = dict(base_query)
+    query_params['page'] = str(page)
+    new_query = urlencode(query_params)
+    new_url = urlunparse((scheme, netloc, path, params, new_query, ''))
+    return new_url
+
+
+@lru_cache(maxsize=256)
+def _split_section_url(section_url: str) -> Tuple[str, str, str, str, Tuple[Tuple[str, str], ...]]:
+    """
+    解析 Section URL 中不随页码变化的部分（每个 Section 只解析一次）
+    
+    Returns:
+        (scheme, netloc, path, params, 查询参数键值对)，多值参数已扁平化为首个值
+    """
     parsed = urlparse(section_url)
     query_params = parse_qs(parsed.query, keep_blank_values=True)
-    query_params['page'] = [str(page)]
-    # 将多值参数扁平化为单值
-    new_query = urlencode({k: v[0] for k, v in query_params.items()})
-    new_url = urlunparse((
-        parsed.scheme, parsed.netloc, parsed.path,
-        parsed.params, new_query, ''
-    ))
-    return new_url
+    return (
+        parsed.scheme, parsed.netloc, parsed.path, parsed.params,
+        tuple((k, v[0]) for k, v in query_params.items()),
+    )
 
 
 def extract_product_links(driver, section_url: str, total_items: int = 0) -> List[str]:
@@ -267,8 +522,6 @@ def extract_product_links(driver, section_url: str, total_items: int = 0) -> Lis
     Returns:
         商品 listing_id 列表
     """
-    from selenium.webdriver.common.by import By
-    
     all_listing_ids = []
     seen_ids = set()
     items_per_page = 0  # 从第一页动态获取
@@ -288,25 +541,25 @@ def extract_product_links(driver, section_url: str, total_items: int = 0) -> Lis
         
         # 导航到当前页
         driver.get(page_url)
-        time.sleep(3)  # 等待页面加载
+        wait_for_page_ready(driver, LISTING_CARD_SELECTOR, timeout=10)
         
         # 滚动页面以触发懒加载
         scroll_page(driver)
         
         # 提取当前页的商品 listing_id
         try:
-            product_cards = driver.find_elements(
-                By.CSS_SELECTOR, 
-                'div.v2-listing-card[data-listing-id]'
-            )
+            card_ids = driver.execute_script(_ATTR_VALUES_JS, LISTING_CARD_SELECTOR, 'data-listing-id')
             
             page_ids = []
-            for card in product_cards:
-                listing_id = card.get_attribute('data-listing-id')
+            # 内层循环中用到的方法先绑定为局部变量
+            seen_add = seen_ids.add
+            page_append = page_ids.append
+            ids_append = all_listing_ids.append
+            for listing_id in card_ids:
                 if listing_id and listing_id not in seen_ids:
-                    seen_ids.add(listing_id)
-                    page_ids.append(listing_id)
-                    all_listing_ids.append(listing_id)
+                    seen_add(listing_id)
+                    page_append(listing_id)
+                    ids_append(listing_id)
             
             print(f"  ✓ 本页找到 {len(page_ids)} 个新商品")
             
@@ -342,27 +595,34 @@ def extract_product_links(driver, section_url: str, total_items: int = 0) -> Lis
     return all_listing_ids
 
 
-def scroll_page(driver, scroll_times: int = 5):
+_SCROLL_TO_BOTTOM_JS = (
+    "window.scrollTo(0, document.body.scrollHeight);"
+    "return document.querySelectorAll(arguments[0]).length;"
+)
+_COUNT_CARDS_JS = "return document.querySelectorAll(arguments[0]).length;"
+
+
+def scroll_page(driver, settle: float = 1.5):
     """
     滚动页面以触发懒加载
     
+    商品网格通常由服务端直接渲染：只滚动到底部一次，
+    在 settle 秒内等待卡片数量增加（有懒加载时），随后回到顶部
+    
     Args:
         driver: Selenium WebDriver 实例
-        scroll_times: 滚动次数
+        settle: 等待懒加载新卡片出现的最长时间（秒）
     """
-    for i in range(scroll_times):
-        # 随机滚动距离
-        scroll_distance = random.randint(300, 600)
-        driver.execute_script(f"window.scrollBy(0, {scroll_distance})")
-        time.sleep(random.uniform(0.3, 0.8))
-    
-    # 滚动到底部确保所有内容加载
-    driver.execute_script("window.scrollTo(0, document.body.scrollHeight)")
-    time.sleep(1)
+    before = driver.execute_script(_SCROLL_TO_BOTTOM_JS, LISTING_CARD_SELECTOR)
+    try:
+        WebDriverWait(driver, settle, poll_frequency=0.25).until(
+            lambda d: d.execute_script(_COUNT_CARDS_JS, LISTING_CARD_SELECTOR) > before
+        )
+    except TimeoutException:
+        pass
     
     # 滚动回顶部
     driver.execute_script("window.scrollTo(0, 0)")
-    time.sleep(0.5)
 
 
 def get_section_info(driver, section_id: str = None) -> Tuple[str, int]:
@@ -380,22 +640,19 @@ def get_section_info(driver, section_id: str = None) -> Tuple[str, int]:
     Returns:
         Tuple[section_name, total_items]
     """
-    from selenium.webdriver.common.by import By
-    
     section_name = "section"
     total_items = 0
     
     if section_id:
+        button_locator, tab_locator = _section_locators(section_id)
+        
         # 方法1: 小屏幕下拉菜单 - 查找 button[data-section-id]
         try:
-            button = driver.find_element(
-                By.CSS_SELECTOR,
-                f'button[data-section-id="{section_id}"]'
-            )
+            button = driver.find_element(*button_locator)
             # 按钮文本格式: "Canvas (41)"
             button_text = button.text.strip()
             # 解析 "名称 (数量)" 格式
-            match = re.match(r'^(.+?)\s*\((\d+)\)\s*$', button_text)
+            match = _NAME_COUNT_RE.match(button_text)
             if match:
                 section_name = match.group(1).strip()
                 total_items = int(match.group(2))
@@ -406,15 +663,12 @@ def get_section_info(driver, section_id: str = None) -> Tuple[str, int]:
         
         # 方法2: 大屏幕侧边栏 - 查找 li[data-section-id]
         try:
-            tab = driver.find_element(
-                By.CSS_SELECTOR,
-                f'li[data-section-id="{section_id}"]'
-            )
-            spans = tab.find_elements(By.CSS_SELECTOR, 'span')
+            tab = driver.find_element(*tab_locator)
+            spans = tab.find_elements(*_SPANS)
             if len(spans) >= 2:
                 section_name = spans[0].text.strip()
                 count_text = spans[1].text.strip()
-                count_match = re.search(r'(\d+)', count_text)
+                count_match = _COUNT_RE.search(count_text)
                 if count_match:
                     total_items = int(count_match.group(1))
                 print(f"  ✓ 从侧边栏获取: {section_name} ({total_items} 件商品)")
@@ -424,13 +678,10 @@ def get_section_info(driver, section_id: str = None) -> Tuple[str, int]:
     
     # 方法3: 小屏幕 - 从下拉菜单触发按钮获取当前选中项
     try:
-        trigger = driver.find_element(
-            By.CSS_SELECTOR,
-            '.wt-menu__trigger .wt-menu__trigger__label'
-        )
+        trigger = driver.find_element(*_MENU_TRIGGER_LABEL)
         trigger_text = trigger.text.strip()
         # 格式: "Canvas (41)"
-        match = re.match(r'^(.+?)\s*\((\d+)\)\s*$', trigger_text)
+        match = _NAME_COUNT_RE.match(trigger_text)
         if match:
             section_name = match.group(1).strip()
             total_items = int(match.group(2))
@@ -440,22 +691,15 @@ def get_section_info(driver, section_id: str = None) -> Tuple[str, int]:
         print(f"  方法3 (menu trigger) 未匹配: {type(e).__name__}")
     
     # 方法4: 查找选中的 tab（大屏幕侧边栏备用方案）
-    selectors = [
-        'li.wt-tab__item[aria-selected="true"]',
-        'li.wt-tab__item.is-selected',
-        'li[role="tab"][aria-selected="true"]',
-        'li[role="tab"].is-selected',
-    ]
-    
-    for selector in selectors:
+    for locator in _SELECTED_TAB_LOCATORS:
         try:
-            selected_tab = driver.find_element(By.CSS_SELECTOR, selector)
+            selected_tab = driver.find_element(*locator)
             if selected_tab:
-                spans = selected_tab.find_elements(By.CSS_SELECTOR, 'span')
+                spans = selected_tab.find_elements(*_SPANS)
                 if len(spans) >= 2:
                     section_name = spans[0].text.strip()
                     count_text = spans[1].text.strip()
-                    count_match = re.search(r'(\d+)', count_text)
+                    count_match = _COUNT_RE.search(count_text)
                     if count_match:
                         total_items = int(count_match.group(1))
                     print(f"  ✓ 从侧边栏获取: {section_name} ({total_items} 件商品)")
@@ -468,6 +712,15 @@ def get_section_info(driver, section_id: str = None) -> Tuple[str, int]:
     return section_name, total_items
 
 
+@lru_cache(maxsize=64)
+def _section_locators(section_id: str) -> Tuple[Tuple[str, str], Tuple[str, str]]:
+    """构造指定 section_id 的下拉按钮 / 侧边栏 tab 定位器"""
+    return (
+        (By.CSS_SELECTOR, f'button[data-section-id="{section_id}"]'),
+        (By.CSS_SELECTOR, f'li[data-section-id="{section_id}"]'),
+    )
+
+
 class ImageNameTracker:
     """
     跟踪图片命名，处理同名商品
@@ -482,6 +735,10 @@ class ImageNameTracker:
         # 记录每个商品名称出现的次数
         self.name_counts: Dict[str, int] = defaultdict(int)
     
+    def reset(self):
+        """清空计数（进入新的输出目录时调用）"""
+        self.name_counts.clear()
+    
     def get_suffix(self, product_name: str) -> str:
         """
         获取文件名后缀
@@ -500,29 +757,20 @@ class ImageNameTracker:
         else:
             return f"({count})"
     
-    def generate_filename(self, product_name: str, image_index: int, ext: str = "jpg") -> str:
+    def begin_product(self, display_name: str) -> Tuple[str, str]:
         """
-        生成图片文件名
+        开始处理一个商品：清理名称并分配同名后缀
         
-        注意：这个方法应该在处理完一个商品的所有图片后调用一次 get_suffix
-        然后用返回的后缀生成所有图片文件名
+        每个商品只调用一次，返回值供该商品的所有图片复用
         
         Args:
-            product_name: 商品标题（原始）
-            image_index: 图片序号（从 1 开始）
-            ext: 文件扩展名
+            display_name: 商品标题（已过滤屏蔽词）
             
         Returns:
-            完整文件名，如 "poster-1.jpg" 或 "poster-1(1).jpg"
+            Tuple[安全文件名, 后缀]，图片文件名为 f"{safe_name}-{序号}{suffix}.{ext}"
         """
-        safe_name = sanitize_filename(product_name)
-        suffix = self.get_suffix(safe_name) if image_index == 1 else self._last_suffix
-        
-        # 保存后缀供同一商品的其他图片使用
-        if image_index == 1:
-            self._last_suffix = suffix
-        
-        return f"{safe_name}-{image_index}{suffix}.{ext}"
+        safe_name = sanitize_filename(display_name)
+        return safe_name, self.get_suffix(safe_name)
 
 
 def download_images_to_section(
@@ -531,7 +779,8 @@ def download_images_to_section(
     output_dir: Path,
     name_tracker: ImageNameTracker,
     image_selection: List[int] = None,
-    filter_words: List[str] = None
+    title_filter: Optional[TitleFilter] = None,
+    session: Optional[requests.Session] = None
 ) -> int:
     """
     下载商品图片到 Section 目录
@@ -542,79 +791,135 @@ def download_images_to_section(
         output_dir: 输出目录
         name_tracker: 文件名跟踪器
         image_selection: 要下载的图片序号列表（1-indexed），None 表示全部
-        filter_words: 从标题中过滤的词汇列表
+        title_filter: 标题屏蔽词过滤器
+        session: 下载用的 HTTP 会话，None 表示使用 real_chrome_scraper 的共享会话
         
     Returns:
         成功下载的图片数量
     """
+    with ThreadPoolExecutor(max_workers=SECTION_DOWNLOAD_WORKERS) as executor:
+        futures = _submit_section_downloads(executor, images, product_name, output_dir, name_tracker,
+                                            image_selection, title_filter, session)
+        return _collect_section_downloads(futures)
+
+
+def _submit_section_downloads(
+    executor: ThreadPoolExecutor,
+    images: List[str],
+    product_name: str,
+    output_dir: Path,
+    name_tracker: ImageNameTracker,
+    image_selection: Optional[List[int]] = None,
+    title_filter: Optional[TitleFilter] = None,
+    session: Optional[requests.Session] = None,
+    tag: str = ""
+) -> List[Future]:
+    """
+    确定商品要下载的图片并提交到线程池，立即返回（参数同 download_images_to_section，tag 为日志前缀）
+    
+    Returns:
+        每张图片的 Future 列表，交给 _collect_section_downloads 等待
+    """
     if not images:
-        return 0
+        return []
     
     # 应用标题过滤
-    try:
-        from .utils import filter_title
-    except ImportError:
-        from utils import filter_title
     display_name = product_name
-    if filter_words:
-        display_name = filter_title(product_name, filter_words)
+    if title_filter:
+        display_name = title_filter.apply(product_name)
     
-    safe_name = sanitize_filename(display_name)
-    suffix = name_tracker.get_suffix(safe_name)
+    safe_name, suffix = name_tracker.begin_product(display_name)
     
     # 确定要下载的图片
     if image_selection:
-        valid_indices = [i for i in image_selection if 1 <= i <= len(images)]
-        skipped_indices = [i for i in image_selection if i > len(images)]
+        # 集合运算区分有效 / 超出范围的序号（range 的 in 判断是 O(1)）
+        sel_set = set(image_selection)
+        available = range(1, len(images) + 1)
+        valid_indices = sorted(i for i in sel_set if i in available)
+        skipped_indices = sorted(sel_set.difference(available))
         
         if skipped_indices:
-            print(f"    ⚠️ 跳过不存在的序号: {skipped_indices}")
+            print(f"{tag}    ⚠️ 跳过不存在的序号: {skipped_indices}")
         
         if not valid_indices:
-            print("    ⚠️ 没有有效的图片序号")
-            return 0
+            print(f"{tag}    ⚠️ 没有有效的图片序号")
+            return []
         
         download_list = [(i, images[i-1]) for i in valid_indices]
     else:
         download_list = [(i+1, url) for i, url in enumerate(images)]
     
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36",
-        "Referer": "https://www.etsy.com/"
-    }
+    # 同一商品的图片互不依赖，小线程池并发下载；所有商品共用一个会话（keep-alive + 重试）
+    if session is None:
+        session = _SESSION
+    return [
+        executor.submit(_download_section_image, session, idx, url, safe_name, suffix, output_dir)
+        for idx, url in download_list
+    ]
+
+
+def _collect_section_downloads(futures: List[Future], tag: str = "") -> int:
+    """
+    等待一个商品的图片下载完成，并按序号一次性输出结果
     
-    downloaded = 0
-    for idx, url in download_list:
-        try:
-            # 获取文件扩展名
-            ext = url.split('.')[-1].split('?')[0] or 'jpg'
-            if ext not in ['jpg', 'jpeg', 'png', 'gif', 'webp']:
-                ext = 'jpg'
-            
-            # 生成文件名
-            filename = f"{safe_name}-{idx}{suffix}.{ext}"
-            filepath = output_dir / filename
-            
-            # 下载图片
-            resp = requests.get(url, headers=headers, timeout=30)
-            if resp.status_code == 200:
-                filepath.write_bytes(resp.content)
-                print(f"    ✓ {filename}")
-                downloaded += 1
-            else:
-                print(f"    ✗ {filename} (HTTP {resp.status_code})")
-                
-        except Exception as e:
-            print(f"    ✗ 图片 {idx} 下载失败: {e}")
+    Args:
+        futures: _submit_section_downloads 返回的 Future 列表
+        tag: 日志前缀（多浏览器并行时标明所属 Section）
         
-        # 短暂延迟
-        time.sleep(random.uniform(0.2, 0.5))
+    Returns:
+        成功下载的图片数量
+    """
+    downloaded = 0
+    lines = []
+    for future in as_completed(futures):
+        idx, filename, err = future.result()
+        if err is None:
+            lines.append((idx, f"{tag}    ✓ {filename}"))
+            downloaded += 1
+        elif filename:
+            lines.append((idx, f"{tag}    ✗ {filename} ({err})"))
+        else:
+            lines.append((idx, f"{tag}    ✗ 图片 {idx} 下载失败: {err}"))
+    
+    if lines:
+        lines.sort()
+        print('\n'.join(line for _, line in lines))
     
     return downloaded
 
 
+def _download_section_image(session: requests.Session, idx: int, url: str,
+                            safe_name: str, suffix: str, output_dir: Path) -> tuple:
+    """
+    下载单张 Section 商品图片（在线程池中执行）
+    
+    Returns:
+        (序号, 文件名, 错误信息)，成功时错误信息为 None
+    """
+    filename = None
+    try:
+        # 生成文件名（扩展名只从 URL 路径部分解析）
+        filename = f"{safe_name}-{idx}{suffix}.{image_extension(url)}"
+        filepath = output_dir / filename
+        
+        # 每个线程发起请求前随机抖动一下，避免同时打到 CDN
+        time.sleep(random.uniform(0.1, 0.3))
+        
+        # 下载图片（流式写盘，整张图片不在内存中缓存）
+        with session.get(url, timeout=30, stream=True) as resp:
+            if resp.status_code != 200:
+                return idx, filename, f"HTTP {resp.status_code}"
+            resp.raw.decode_content = True
+            with open(filepath, 'wb') as f:
+                shutil.copyfileobj(resp.raw, f, length=64 * 1024)
+        return idx, filename, None
+    except Exception as e:
+        return idx, filename, e
+
+
 def process_product(driver, listing_id: str, output_dir: Path, name_tracker: ImageNameTracker,
-                    image_selection: List[int] = None, filter_words: List[str] = None) -> bool:
+                    image_selection: List[int] = None, title_filter: Optional[TitleFilter] = None,
+                    session: Optional[requests.Session] = None) -> bool:
     """
     处理单个商品：导航、提取数据、下载图片
     
@@ -624,47 +929,92 @@ def process_product(driver, listing_id: str, output_dir: Path, name_tracker: Ima
         output_dir: 输出目录
         name_tracker: 文件名跟踪器
         image_selection: 要下载的图片序号列表
-        filter_words: 标题过滤词列表
+        title_filter: 标题屏蔽词过滤器
+        session: 图片下载用的 HTTP 会话，None 表示使用 real_chrome_scraper 的共享会话
         
     Returns:
         是否成功处理
     """
+    with ThreadPoolExecutor(max_workers=SECTION_DOWNLOAD_WORKERS) as executor:
+        return _finish_product(_start_product(driver, listing_id, output_dir, name_tracker, executor,
+                                              image_selection, title_filter, session))
+
+
+def _start_product(driver, listing_id: str, output_dir: Path, name_tracker: ImageNameTracker,
+                   executor: ThreadPoolExecutor, image_selection: Optional[List[int]] = None,
+                   title_filter: Optional[TitleFilter] = None,
+                   session: Optional[requests.Session] = None,
+                   tag: str = "") -> Optional[Tuple[List[Future], int]]:
+    """
+    导航到商品页面、提取数据，并把图片下载提交到线程池（不等待下载完成）
+    
+    Args:
+        executor: 图片下载线程池
+        tag: 日志前缀（多浏览器并行时标明所属 Section）
+        其余参数同 process_product
+        
+    Returns:
+        Tuple[图片下载 Future 列表, 应下载数量]；无法提取数据或没有图片时返回 None
+    """
     product_url = f"https://www.etsy.com/listing/{listing_id}"
     
     try:
         # 导航到商品页面
         driver.get(product_url)
-        time.sleep(random.uniform(2, 4))  # 随机延迟
+        # 等待商品标题/图片区域出现，而不是固定睡 2-4 秒（商品间的随机延迟由调用方负责）
+        wait_for_page_ready(driver)
         
         # 使用 real_chrome_scraper 的数据提取函数
         # 但我们需要跳过验证检测（因为已经在 Section 页面验证过了）
         data = extract_product_data_silent(driver)
         
         if not data or not data.get('title'):
-            print(f"    ⚠️ 无法提取商品数据")
-            return False
+            print(f"{tag}    ⚠️ 无法提取商品数据")
+            return None
         
-        # 下载图片
+        # 提交图片下载
         images = data.get('images', [])
         if images:
-            downloaded = download_images_to_section(
+            futures = _submit_section_downloads(
+                executor,
                 images, 
                 data['title'], 
                 output_dir, 
                 name_tracker,
                 image_selection=image_selection,
-                filter_words=filter_words
+                title_filter=title_filter,
+                session=session,
+                tag=tag
             )
             total_to_download = len(image_selection) if image_selection else len(images)
-            print(f"    → 下载了 {downloaded}/{total_to_download} 张图片")
-            return downloaded > 0
+            return futures, total_to_download
         else:
-            print(f"    ⚠️ 没有找到图片")
-            return False
+            print(f"{tag}    ⚠️ 没有找到图片")
+            return None
             
     except Exception as e:
-        print(f"    ✗ 处理失败: {e}")
+        print(f"{tag}    ✗ 处理失败: {e}")
+        return None
+
+
+def _finish_product(started: Optional[Tuple[List[Future], int]], tag: str = "") -> bool:
+    """
+    等待 _start_product 提交的图片下载完成并输出结果
+    
+    Args:
+        started: _start_product 的返回值
+        tag: 日志前缀（多浏览器并行时标明所属 Section）
+        
+    Returns:
+        是否成功处理（至少下载了一张图片）
+    """
+    if started is None:
         return False
+    
+    futures, total_to_download = started
+    downloaded = _collect_section_downloads(futures, tag)
+    print(f"{tag}    → 下载了 {downloaded}/{total_to_download} 张图片")
+    return downloaded > 0
 
 
 def extract_product_data_silent(driver) -> Optional[Dict]:
@@ -678,25 +1028,18 @@ def extract_product_data_silent(driver) -> Optional[Dict]:
     Returns:
         商品数据字典
     """
-    from selenium.webdriver.common.by import By
-    
     data = {}
     
-    # 模拟人类滚动
-    for _ in range(2):
-        scroll_distance = random.randint(200, 400)
-        driver.execute_script(f"window.scrollBy(0, {scroll_distance})")
-        time.sleep(random.uniform(0.3, 0.8))
-    driver.execute_script("window.scrollTo(0, 0)")
-    time.sleep(0.5)
+    # 模拟人类滚动（整套节奏在浏览器内完成，一次 WebDriver 往返）
+    simulate_scroll(driver, steps=2, max_px=400, min_pause=0.3, max_pause=0.8, settle=0.5)
     
     # 提取标题
     try:
-        title_el = driver.find_element(By.CSS_SELECTOR, 'h1[data-buy-box-listing-title="true"]')
+        title_el = driver.find_element(*_LISTING_TITLE)
         data['title'] = title_el.text.strip()
     except:
         try:
-            title_el = driver.find_element(By.TAG_NAME, 'h1')
+            title_el = driver.find_element(*_ANY_H1)
             data['title'] = title_el.text.strip()
         except:
             data['title'] = None
@@ -705,54 +1048,51 @@ def extract_product_data_silent(driver) -> Optional[Dict]:
     images = []
     seen_ids = set()
     
+    seen_add = seen_ids.add
+    images_append = images.append
+    image_id_search = _IMAGE_ID_RE.search
+    image_size_sub = _IMAGE_SIZE_RE.sub
+    
     def extract_image_id(url):
-        match = re.search(r'/il_[^.]+\.(\d+)_', url)
+        match = image_id_search(url)
         return match.group(1) if match else None
     
     def convert_to_fullsize(url):
-        return re.sub(r'il_[^.]+\.', 'il_fullxfull.', url)
+        return image_size_sub('il_fullxfull.', url)
     
     # 方法0: data-src-zoom-image（最优先）
     try:
-        zoom_imgs = driver.find_elements(
-            By.CSS_SELECTOR, 
-            'li[data-carousel-pane]:not([data-video-pane]) img[data-src-zoom-image]'
-        )
-        for img in zoom_imgs:
-            zoom_url = img.get_attribute('data-src-zoom-image')
+        zoom_urls = driver.execute_script(_ATTR_VALUES_JS, _ZOOM_IMAGE_SELECTOR, 'data-src-zoom-image')
+        for zoom_url in zoom_urls:
             if zoom_url and 'etsystatic.com' in zoom_url:
                 img_id = extract_image_id(zoom_url)
                 if img_id and img_id not in seen_ids:
-                    seen_ids.add(img_id)
-                    images.append(zoom_url)
+                    seen_add(img_id)
+                    images_append(zoom_url)
+                    if len(images) >= MAX_PRODUCT_IMAGES:
+                        break
     except:
         pass
     
     # 方法1: 画廊区域（备选）
     if not images:
-        gallery_selectors = [
-            'div[data-component="listing-page-image-carousel"] img',
-            'ul[data-carousel-pagination-list] img',
-            'ul.carousel-pane-list img[src*="il_"]',
-        ]
-        
-        for selector in gallery_selectors:
+        for selector in _GALLERY_IMAGE_SELECTORS:
             try:
-                gallery_imgs = driver.find_elements(By.CSS_SELECTOR, selector)
-                for img in gallery_imgs:
-                    src = img.get_attribute('src') or img.get_attribute('data-src')
+                for src in driver.execute_script(_IMAGE_SOURCES_JS, selector):
                     if src and 'il_' in src and 'etsystatic.com' in src:
                         img_id = extract_image_id(src)
                         if img_id and img_id not in seen_ids:
-                            seen_ids.add(img_id)
-                            images.append(convert_to_fullsize(src))
+                            seen_add(img_id)
+                            images_append(convert_to_fullsize(src))
+                            if len(images) >= MAX_PRODUCT_IMAGES:
+                                break
                 if images:
                     break
             except:
                 continue
     
-    # 去重并限制数量
-    data['images'] = list(dict.fromkeys(images))[:15]
+    # seen_ids 已保证按图片 ID 去重，收集时也已限制数量
+    data['images'] = images
     
     return data
 
@@ -763,8 +1103,10 @@ def process_all_products(
     output_dir: Path,
     delay: float = 2.0,
     image_selection: List[int] = None,
-    filter_words: List[str] = None,
-    progress: ScrapeProgress = None
+    title_filter: Optional[TitleFilter] = None,
+    progress: ScrapeProgress = None,
+    session: Optional[requests.Session] = None,
+    tag: str = ""
 ) -> Tuple[int, int]:
     """
     批量处理所有商品
@@ -775,8 +1117,10 @@ def process_all_products(
         output_dir: 输出目录
         delay: 商品间延迟（秒）
         image_selection: 要下载的图片序号列表
-        filter_words: 标题过滤词列表
+        title_filter: 标题屏蔽词过滤器
         progress: 进度管理器（可选）
+        session: 图片下载用的 HTTP 会话，None 表示使用 real_chrome_scraper 的共享会话
+        tag: 日志前缀，多浏览器并行时标明所属 Section（如 "[S2] "）
         
     Returns:
         Tuple[成功数, 失败数]
@@ -787,33 +1131,320 @@ def process_all_products(
     name_tracker = ImageNameTracker()
     
     print(f"\n{'='*60}")
-    print(f"开始处理 {total} 个商品")
+    print(f"{tag}开始处理 {total} 个商品")
     if image_selection:
-        print(f"图片选择: {image_selection}")
-    if filter_words:
-        print(f"标题过滤: {filter_words}")
+        print(f"{tag}图片选择: {image_selection}")
+    if title_filter:
+        print(f"{tag}标题过滤: {list(title_filter.words)}")
     print(f"{'='*60}")
     
-    for i, listing_id in enumerate(listing_ids, 1):
-        print(f"\n[{i}/{total}] 商品 ID: {listing_id}")
+    # 整个 Section 共用一个下载线程池：浏览器只在当前线程中操作，图片下载在后台线程进行
+    with ThreadPoolExecutor(max_workers=SECTION_DOWNLOAD_WORKERS) as executor:
+        for i, listing_id in enumerate(listing_ids, 1):
+            print(f"\n{tag}[{i}/{total}] 商品 ID: {listing_id}")
+            
+            started = _start_product(driver, listing_id, output_dir, name_tracker, executor,
+                                     image_selection=image_selection, title_filter=title_filter,
+                                     session=session, tag=tag)
+            
+            # 随机延迟，避免被封；从图片开始下载时计时，下载与等待重叠进行
+            deadline = time.monotonic()
+            if i < total:
+                deadline += max(1.0, delay + random.uniform(-0.5, 1.0))  # 至少等待 1 秒
+            
+            if _finish_product(started, tag):
+                success_count += 1
+                # 成功后立即保存进度
+                if progress:
+                    progress.save(listing_id)
+            else:
+                fail_count += 1
+            
+            wait_time = deadline - time.monotonic()
+            if wait_time > 0:
+                print(f"{tag}    ⏳ 等待 {wait_time:.1f} 秒...")
+                time.sleep(wait_time)
+    
+    return success_count, fail_count
+
+
+# 多浏览器并行时，保护输出目录的选择（避免两个同名 Section 同时选中同一目录）
+_SECTION_DIR_LOCK = threading.Lock()
+# 目录名统一 casefold 后比较：macOS / Windows 的文件系统不区分大小写
+_CLAIMED_SECTION_DIRS: Dict[Path, str] = {}
+# 输出根目录下已有的子目录名（casefold），每个根目录只扫描一次（本次运行创建的目录也会加入）
+_EXISTING_SECTION_DIRS: Dict[Path, Set[str]] = {}
+
+
+def _existing_section_dirs(output_base: Path) -> Set[str]:
+    """
+    返回输出根目录下已有的子目录名，已 casefold（首次调用时 scandir 一次，之后走缓存；调用方需持有 _SECTION_DIR_LOCK）
+    
+    Args:
+        output_base: 输出根目录
         
-        if process_product(driver, listing_id, output_dir, name_tracker,
-                          image_selection=image_selection, filter_words=filter_words):
-            success_count += 1
-            # 成功后立即保存进度
-            if progress:
-                progress.save(listing_id)
-        else:
-            fail_count += 1
+    Returns:
+        子目录名（casefold）集合
+    """
+    names = _EXISTING_SECTION_DIRS.get(output_base)
+    if names is None:
+        try:
+            with os.scandir(output_base) as it:
+                names = {entry.name.casefold() for entry in it if entry.is_dir()}
+        except OSError:
+            names = set()
+        _EXISTING_SECTION_DIRS[output_base] = names
+    return names
+
+
+def _claim_section_dir(output_base: Path, section_name: str, shop_name: str, section_id: str) -> Path:
+    """
+    确定 Section 的输出目录并标记为本次运行占用
+    
+    Args:
+        output_base: 输出根目录
+        section_name: Section 名称
+        shop_name: 店铺名称
+        section_id: Section ID
         
-        # 随机延迟，避免被封
-        if i < total:
-            wait_time = delay + random.uniform(-0.5, 1.0)
-            wait_time = max(1.0, wait_time)  # 至少等待 1 秒
-            print(f"    ⏳ 等待 {wait_time:.1f} 秒...")
-            time.sleep(wait_time)
+    Returns:
+        输出目录路径（已创建）
+    """
+    # 创建输出目录（使用 section 实际名称）
+    if section_name and section_name != "section":
+        section_dir_name = sanitize_folder_name(section_name)
+    else:
+        section_dir_name = f"{shop_name}_{section_id}"
     
-    return success_count, fail_count
+    with _SECTION_DIR_LOCK:
+        existing = _existing_section_dirs(output_base)
+        
+        # 同名文件夹冲突检测：已被本次运行的其他 Section 占用，或进度文件属于其他 Section
+        candidate_path = output_base / section_dir_name
+        owner = _CLAIMED_SECTION_DIRS.get(output_base / section_dir_name.casefold())
+        if owner is not None and owner != section_id:
+            section_dir_name = f"{section_dir_name}_{section_id}"
+        elif section_dir_name.casefold() in existing:
+            # 只有同名目录已存在时才读取其归属（没有进度信息则直接复用该目录）
+            existing_sid = read_section_id(candidate_path)
+            if existing_sid is not None and existing_sid != section_id:
+                section_dir_name = f"{section_dir_name}_{section_id}"
+        
+        output_path = output_base / section_dir_name
+        folded_name = section_dir_name.casefold()
+        _CLAIMED_SECTION_DIRS[output_base / folded_name] = section_id
+        
+        # 目录已存在（扫描到或本次已创建）时不再 mkdir
+        if folded_name not in existing:
+            output_path.mkdir(parents=True, exist_ok=True)
+            existing.add(folded_name)
+    
+    return output_path
+
+
+def _process_section(driver, section: Dict[str, str], sec_idx: int, total_sections: int,
+                     args: argparse.Namespace, image_selection: Optional[List[int]],
+                     title_filter: TitleFilter,
+                     navigate: bool, tag: str = "") -> Optional[Tuple[int, int, int, int]]:
+    """
+    处理单个 Section：导航、获取信息、提取商品链接并下载图片
+    
+    Args:
+        driver: Selenium WebDriver 实例
+        section: 解析后的 Section（url / shop_name / section_id）
+        sec_idx: Section 序号（从 1 开始）
+        total_sections: Section 总数
+        args: 命令行参数
+        image_selection: 要下载的图片序号列表
+        title_filter: 标题屏蔽词过滤器
+        navigate: 是否需要在新标签页中打开 Section（浏览器启动时打开的第一个 Section 无需导航）
+        tag: 日志前缀，多浏览器并行时标明所属 Section（如 "[S2] "）
+        
+    Returns:
+        Tuple[成功数, 失败数, 跳过数, 是否完成(0/1)]；用户取消时返回 None
+    """
+    url = section['url']
+    shop_name = section['shop_name']
+    section_id = section['section_id']
+    
+    if total_sections > 1:
+        print(f"\n{'='*60}")
+        print(f"{tag}[Section {sec_idx}/{total_sections}] {shop_name}")
+        print(f"{tag}  Section ID: {section_id}")
+        print(f"{'='*60}")
+    
+    # 后续 Section 在新标签页中打开，处理完关闭，复用同一浏览器的缓存与连接
+    opened_tab = False
+    if navigate:
+        try:
+            driver.switch_to.new_window('tab')
+            opened_tab = True
+            driver.get(url)
+            wait_for_page_ready(driver, LISTING_CARD_SELECTOR, timeout=10)
+        except Exception as e:
+            print(f"{tag}  ❌ 导航失败: {e}")
+            if opened_tab:
+                _close_current_tab(driver)
+            return 0, 0, 0, 0
+    
+    try:
+        return _scrape_current_section(driver, section, total_sections, args,
+                                       image_selection, title_filter, tag)
+    finally:
+        if opened_tab:
+            _close_current_tab(driver)
+
+
+def _prefetch_url(driver, url: str):
+    """在当前页面中后台请求 url（不等待响应），失败时忽略"""
+    try:
+        driver.execute_script(_PREFETCH_JS, url)
+    except Exception:
+        pass
+
+
+def _close_current_tab(driver):
+    """关闭当前标签页并切回第一个标签页"""
+    driver.close()
+    driver.switch_to.window(driver.window_handles[0])
+
+
+def _scrape_current_section(driver, section: Dict[str, str], total_sections: int,
+                            args: argparse.Namespace, image_selection: Optional[List[int]],
+                            title_filter: TitleFilter, tag: str = "") -> Optional[Tuple[int, int, int, int]]:
+    """
+    在当前已打开的 Section 页面上获取信息、提取商品链接并下载图片
+    
+    参数与返回值同 _process_section
+    """
+    url = section['url']
+    shop_name = section['shop_name']
+    section_id = section['section_id']
+    
+    # 获取 Section 信息（在创建输出目录之前获取 section 名称）
+    print(f"\n{tag}  📌 获取 Section 信息...")
+    section_name, total_items = get_section_info(driver, section_id)
+    print(f"{tag}    Section: {section_name}")
+    print(f"{tag}    预计商品数: {total_items}")
+    
+    output_path = _claim_section_dir(Path(args.output), section_name, shop_name, section_id)
+    print(f"{tag}  输出目录: {output_path}")
+    
+    # 初始化进度管理器
+    progress = ScrapeProgress(output_path, url, shop_name, section_id)
+    
+    # 加载已有进度（如果启用断点续传）
+    completed_ids = set()
+    if args.resume:
+        try:
+            completed_ids = progress.load()
+            if completed_ids:
+                print(f"{tag}  📋 检测到进度：已完成 {len(completed_ids)} 个商品")
+        except ValueError as e:
+            print(f"{tag}  ❌ {e}")
+            return 0, 0, 0, 0
+    
+    # 提取商品链接
+    print(f"\n{tag}  📌 提取商品链接...")
+    
+    # 提取所有商品链接（传入 total_items 用于计算翻页）
+    listing_ids = extract_product_links(driver, url, total_items=total_items)
+    
+    if not listing_ids:
+        print(f"\n{tag}  ❌ 没有找到任何商品！")
+        return 0, 0, 0, 0
+    
+    print(f"\n{tag}  ✓ 共找到 {len(listing_ids)} 个商品")
+    
+    # 设置总商品数
+    progress.set_total_found(len(listing_ids))
+    
+    # 过滤已完成的商品
+    pending_ids = listing_ids
+    skipped_count = 0
+    if args.resume and completed_ids:
+        pending_ids = progress.pending(listing_ids)
+        skipped_count = len(listing_ids) - len(pending_ids)
+        if skipped_count > 0:
+            print(f"\n{tag}  📋 断点续传：跳过 {skipped_count} 个已完成商品")
+    
+    if not pending_ids:
+        print(f"\n{tag}  ✓ 所有商品已完成！")
+        return 0, 0, skipped_count, 1
+    
+    # 确认继续（只有单个 Section、未指定 --yes 且在交互终端中时询问）
+    if total_sections == 1 and not args.yes and sys.stdin.isatty():
+        print("\n" + "=" * 60)
+        confirm = input(f"是否开始下载 {len(pending_ids)} 个商品的图片? (Y/n): ")
+        if confirm.lower() == 'n':
+            return None
+    
+    # 处理商品
+    print(f"\n{tag}  📌 下载商品图片 ({len(pending_ids)} 个)...")
+    
+    with progress:
+        success, fail = process_all_products(
+            driver, 
+            pending_ids, 
+            output_path,
+            delay=args.delay,
+            image_selection=image_selection,
+            title_filter=title_filter,
+            progress=progress,
+            tag=tag
+        )
+    
+    # Section 完成状态
+    completed = progress.completed_count == len(listing_ids)
+    if completed:
+        print(f"\n{tag}  ✓ Section 完成！")
+    else:
+        print(f"\n{tag}  📋 进度: {progress.completed_count}/{len(listing_ids)} 完成")
+    
+    return success, fail, skipped_count, int(completed)
+
+
+def _process_section_lane(driver, tasks: List[Tuple[int, Dict[str, str]]], total_sections: int,
+                          args: argparse.Namespace, image_selection: Optional[List[int]],
+                          title_filter: TitleFilter,
+                          tagged: bool = False) -> List[Optional[Tuple[int, int, int, int]]]:
+    """
+    用一个浏览器依次处理分配给它的 Section（多浏览器时每个浏览器一个线程）
+    
+    Args:
+        driver: 该浏览器的 WebDriver 实例（启动时已打开 tasks 中第一个 Section）
+        tasks: (Section 序号, Section) 列表
+        total_sections: Section 总数
+        args: 命令行参数
+        image_selection: 要下载的图片序号列表
+        title_filter: 标题屏蔽词过滤器
+        tagged: 日志是否加 Section 前缀（多浏览器并行时输出会交错）
+        
+    Returns:
+        每个 Section 的处理结果列表（见 _process_section）；出错的 Section 记为 (0, 0, 0, 0)
+    """
+    results = []
+    for n, (sec_idx, section) in enumerate(tasks):
+        tag = f"[S{sec_idx}] " if tagged else ""
+        # 单个 Section 出错（如浏览器断开）不丢弃之前的结果，继续处理后面的 Section
+        try:
+            result = _process_section(driver, section, sec_idx, total_sections, args,
+                                      image_selection, title_filter, navigate=n > 0, tag=tag)
+        except Exception as e:
+            print(f"\n{tag}❌ Section {sec_idx} 处理出错: {e}")
+            result = 0, 0, 0, 0
+        results.append(result)
+        if result is None:
+            break
+        
+        # Section 间延迟（等待期间让浏览器先预取下一个 Section 页面）
+        if n < len(tasks) - 1:
+            _prefetch_url(driver, tasks[n + 1][1]['url'])
+            wait_time = args.section_delay + random.uniform(-0.5, 1.0)
+            wait_time = max(1.0, wait_time)
+            print(f"\n{tag}⏳ 等待 {wait_time:.1f} 秒后处理下一个 Section...")
+            time.sleep(wait_time)
+    return results
 
 
 def main():
@@ -832,6 +1463,9 @@ def main():
   # 带选项
   etsy-section "https://www.etsy.com/shop/MyShop?section_id=12345" --output my_images
   etsy-section "https://www.etsy.com/shop/MyShop?section_id=12345" --delay 3
+  
+  # 多个 Section 用 2 个浏览器并行处理
+  etsy-section "https://...?section_id=111" "https://...?section_id=222" --browsers 2
 
 断点续传:
   - 默认启用断点续传，中断后重新运行会自动跳过已完成的商品
@@ -842,7 +1476,7 @@ def main():
   1. 启动 Chrome 并打开 Section 页面
   2. 你手动完成验证（如果需要）
   3. 按 Enter 开始自动抓取
-  4. 自动遍历所有商品并下载图片（多链接会依次处理）
+  4. 自动遍历所有商品并下载图片（多链接会依次处理，--browsers N 时分摊到 N 个浏览器）
 """
     )
     
@@ -851,6 +1485,8 @@ def main():
     parser.add_argument("--port", "-p", type=int, default=9222, help="Chrome 调试端口（默认: 9222）")
     parser.add_argument("--delay", "-d", type=float, default=2.0, help="商品间延迟秒数（默认: 2）")
     parser.add_argument("--section-delay", type=float, default=3.0, help="Section 间延迟秒数（默认: 3）")
+    parser.add_argument("--browsers", "-b", type=int, default=1,
+                        help=f"并行浏览器数（1-{MAX_BROWSERS}，默认: 1），多个 Section 分摊到多个 Chrome")
     parser.add_argument("--images", "-i", default=None,
                         help="指定下载哪些图片，如: '1' 或 '1,3,5' 或 '2-4' 或 '1,3-5,8'")
     parser.add_argument("--filter", "-f", default=None,
@@ -865,14 +1501,22 @@ def main():
     parser.add_argument("--clear-progress", action="store_true",
                         help="清理进度文件后退出")
     
+    # 无人值守运行
+    parser.add_argument("--yes", "-y", action="store_true",
+                        help="跳过「是否开始下载」确认")
+    browser_group = parser.add_mutually_exclusive_group()
+    browser_group.add_argument("--close-browser", dest="close_browser", action="store_true", default=None,
+                               help="结束后直接关闭 Chrome，不再询问")
+    browser_group.add_argument("--keep-browser", dest="close_browser", action="store_false",
+                               help="结束后保持 Chrome 打开，不再询问")
+    
     args = parser.parse_args()
     
-    # 解析图片选择和过滤词参数
-    try:
-        from .utils import parse_image_selection, parse_filter_words
-    except ImportError:
-        from utils import parse_image_selection, parse_filter_words
+    if not 1 <= args.browsers <= MAX_BROWSERS:
+        print(f"\n❌ 浏览器数必须在 1-{MAX_BROWSERS} 之间")
+        sys.exit(1)
     
+    # 解析图片选择和过滤词参数
     image_selection = None
     filter_words = None
     
@@ -919,15 +1563,16 @@ def main():
                 for subdir in output_base.iterdir():
                     if subdir.is_dir():
                         progress_file = subdir / ".progress.json"
-                        if progress_file.exists():
+                        if progress_file.exists() and read_section_id(subdir) == target_section_id:
                             try:
-                                with open(progress_file, 'r', encoding='utf-8') as f:
-                                    data = json.load(f)
-                                if data.get('section_id') == target_section_id:
-                                    progress_file.unlink()
-                                    print(f"✓ 已清理: {progress_file}")
-                                    cleared += 1
-                                    found = True
+                                progress_file.unlink()
+                                log_file = subdir / ".progress.log"
+                                if log_file.exists():
+                                    log_file.unlink()
+                                (subdir / SECTION_ID_FILE).unlink(missing_ok=True)
+                                print(f"✓ 已清理: {progress_file}")
+                                cleared += 1
+                                found = True
                             except Exception:
                                 pass
             if not found:
@@ -943,6 +1588,8 @@ def main():
         print(f"  图片选择: {image_selection}")
     if filter_words:
         print(f"  标题过滤: {filter_words}")
+    # 屏蔽词只编译一次，传给所有 Section / 商品
+    title_filter = TitleFilter(filter_words)
     
     print("\n" + "=" * 60)
     print("🛍️  ETSY SECTION SCRAPER")
@@ -952,20 +1599,28 @@ def main():
         print(f"\n📋 共 {total_sections} 个 Section 待处理")
     print("=" * 60)
     
-    # 步骤 1：启动 Chrome
+    # 步骤 1：启动 Chrome（每个浏览器使用独立端口，多开时后续实例使用独立用户目录）
+    lanes = min(args.browsers, total_sections)
+    ports = [args.port + i for i in range(lanes)]
+    
     print("\n📌 步骤 1: 启动 Chrome")
     print("-" * 40)
     print("⚠️  请先关闭所有 Chrome 窗口！")
     input("准备好后按 Enter 继续...")
     
-    print("\n启动 Chrome...")
-    chrome_process = start_chrome_with_debug(sections[0]['url'], args.port)
+    print("\n启动 Chrome..." if lanes == 1 else f"\n启动 {lanes} 个 Chrome...")
+    chrome_processes = [
+        start_chrome_with_debug(sections[i]['url'], port, isolated_profile=i > 0)
+        for i, port in enumerate(ports)
+    ]
     
     print("等待浏览器就绪...")
-    if not wait_for_chrome_ready(args.port):
-        print("❌ Chrome 启动失败！")
-        chrome_process.terminate()
-        sys.exit(1)
+    for port in ports:
+        if not wait_for_chrome_ready(port):
+            print(f"❌ Chrome 启动失败！(端口 {port})")
+            for p in chrome_processes:
+                p.terminate()
+            sys.exit(1)
     
     print("✓ Chrome 已启动！")
     
@@ -982,6 +1637,8 @@ def main():
 
 ⏰ 没有时间限制，慢慢来！
 """)
+    if lanes > 1:
+        print(f"⚠️  共打开了 {lanes} 个 Chrome 窗口，每个窗口都需要完成验证")
     print("=" * 60)
     
     input("\n✋ 验证完成、页面加载好后，按 Enter 继续...")
@@ -990,9 +1647,11 @@ def main():
     from selenium import webdriver
     from selenium.webdriver.chrome.options import Options
     
-    options = Options()
-    options.add_experimental_option("debuggerAddress", f"localhost:{args.port}")
-    driver = webdriver.Chrome(options=options)
+    drivers = []
+    for port in ports:
+        options = Options()
+        options.add_experimental_option("debuggerAddress", f"localhost:{port}")
+        drivers.append(webdriver.Chrome(options=options))
     
     # 统计
     total_success = 0
@@ -1001,144 +1660,37 @@ def main():
     sections_completed = 0
     
     try:
-        for sec_idx, section in enumerate(sections, 1):
-            url = section['url']
-            shop_name = section['shop_name']
-            section_id = section['section_id']
-            
-            if total_sections > 1:
-                print(f"\n{'='*60}")
-                print(f"[Section {sec_idx}/{total_sections}] {shop_name}")
-                print(f"  Section ID: {section_id}")
-                print(f"{'='*60}")
-            
-            # 如果不是第一个 Section，需要导航到新页面
-            if sec_idx > 1:
-                try:
-                    driver.get(url)
-                    time.sleep(2)
-                    # 等待页面加载
-                    for _ in range(2):
-                        scroll_distance = random.randint(200, 400)
-                        driver.execute_script(f"window.scrollBy(0, {scroll_distance})")
-                        time.sleep(random.uniform(0.3, 0.8))
-                    driver.execute_script("window.scrollTo(0, 0)")
-                    time.sleep(1)
-                except Exception as e:
-                    print(f"  ❌ 导航失败: {e}")
-                    continue
-            
-            # 获取 Section 信息（在创建输出目录之前获取 section 名称）
-            print(f"\n  📌 获取 Section 信息...")
-            section_name, total_items = get_section_info(driver, section_id)
-            print(f"    Section: {section_name}")
-            print(f"    预计商品数: {total_items}")
-            
-            # 创建输出目录（使用 section 实际名称）
-            if section_name and section_name != "section":
-                section_dir_name = sanitize_folder_name(section_name)
-            else:
-                section_dir_name = f"{shop_name}_{section_id}"
-            
-            # 同名文件夹冲突检测
-            candidate_path = Path(args.output) / section_dir_name
-            if candidate_path.exists():
-                progress_file = candidate_path / ".progress.json"
-                if progress_file.exists():
+        # Section 之间互不依赖：每个浏览器负责 sections[i::lanes]，各自按顺序处理
+        tasks = list(enumerate(sections, 1))
+        if lanes == 1:
+            results = _process_section_lane(drivers[0], tasks, total_sections, args,
+                                            image_selection, title_filter)
+        else:
+            results = []
+            with ThreadPoolExecutor(max_workers=lanes) as executor:
+                futures = [
+                    executor.submit(_process_section_lane, drivers[i], tasks[i::lanes], total_sections,
+                                    args, image_selection, title_filter, tagged=True)
+                    for i in range(lanes)
+                ]
+                for i, future in enumerate(futures, 1):
+                    # 某个浏览器线程意外失败时只丢弃它自己的结果，其他浏览器的统计照常汇总
                     try:
-                        with open(progress_file, 'r', encoding='utf-8') as f:
-                            existing_progress = json.load(f)
-                        if existing_progress.get('section_id') != section_id:
-                            section_dir_name = f"{section_dir_name}_{section_id}"
-                    except Exception:
-                        pass
-            
-            output_path = Path(args.output) / section_dir_name
-            output_path.mkdir(parents=True, exist_ok=True)
-            print(f"  输出目录: {output_path}")
-            
-            # 初始化进度管理器
-            progress = ScrapeProgress(output_path, url, shop_name, section_id)
-            
-            # 加载已有进度（如果启用断点续传）
-            completed_ids = set()
-            if args.resume:
-                try:
-                    completed_ids = progress.load()
-                    if completed_ids:
-                        print(f"  📋 检测到进度：已完成 {len(completed_ids)} 个商品")
-                except ValueError as e:
-                    print(f"  ❌ {e}")
-                    continue
-            
-            # 提取商品链接
-            print(f"\n  📌 提取商品链接...")
-            
-            # 提取所有商品链接（传入 total_items 用于计算翻页）
-            listing_ids = extract_product_links(driver, url, total_items=total_items)
-            
-            if not listing_ids:
-                print(f"\n  ❌ 没有找到任何商品！")
-                continue
-            
-            print(f"\n  ✓ 共找到 {len(listing_ids)} 个商品")
-            
-            # 设置总商品数
-            progress.set_total_found(len(listing_ids))
-            
-            # 过滤已完成的商品
-            pending_ids = listing_ids
-            skipped_count = 0
-            if args.resume and completed_ids:
-                pending_ids = [lid for lid in listing_ids if lid not in completed_ids]
-                skipped_count = len(listing_ids) - len(pending_ids)
-                if skipped_count > 0:
-                    print(f"\n  📋 断点续传：跳过 {skipped_count} 个已完成商品")
-                    total_skipped += skipped_count
-            
-            if not pending_ids:
-                print(f"\n  ✓ 所有商品已完成！")
-                sections_completed += 1
-                continue
-            
-            # 确认继续（只有单个 Section 时询问）
-            if total_sections == 1:
-                print("\n" + "=" * 60)
-                confirm = input(f"是否开始下载 {len(pending_ids)} 个商品的图片? (Y/n): ")
-                if confirm.lower() == 'n':
-                    print("已取消")
-                    chrome_process.terminate()
-                    sys.exit(0)
-            
-            # 处理商品
-            print(f"\n  📌 下载商品图片 ({len(pending_ids)} 个)...")
-            
-            success, fail = process_all_products(
-                driver, 
-                pending_ids, 
-                output_path,
-                delay=args.delay,
-                image_selection=image_selection,
-                filter_words=filter_words,
-                progress=progress
-            )
-            
+                        results.extend(future.result())
+                    except Exception as e:
+                        print(f"\n❌ 浏览器 {i} 出错: {e}")
+        
+        for result in results:
+            if result is None:
+                print("已取消")
+                for p in chrome_processes:
+                    p.terminate()
+                sys.exit(0)
+            success, fail, skipped, completed = result
             total_success += success
             total_fail += fail
-            
-            # Section 完成状态
-            if progress.completed_count == len(listing_ids):
-                sections_completed += 1
-                print(f"\n  ✓ Section 完成！")
-            else:
-                print(f"\n  📋 进度: {progress.completed_count}/{len(listing_ids)} 完成")
-            
-            # Section 间延迟
-            if sec_idx < total_sections:
-                wait_time = args.section_delay + random.uniform(-0.5, 1.0)
-                wait_time = max(1.0, wait_time)
-                print(f"\n⏳ 等待 {wait_time:.1f} 秒后处理下一个 Section...")
-                time.sleep(wait_time)
+            total_skipped += skipped
+            sections_completed += completed
         
         # 显示最终结果
         print("\n" + "=" * 60)
@@ -1154,10 +1706,13 @@ def main():
         print(f"  输出目录: {args.output}")
         
     finally:
-        # 询问是否关闭浏览器
-        close = input("\n是否关闭 Chrome 浏览器? (y/N): ")
-        if close.lower() == 'y':
-            chrome_process.terminate()
+        # 询问是否关闭浏览器（已通过参数指定、或非交互终端时不询问，后者默认保持打开）
+        close = args.close_browser
+        if close is None:
+            close = sys.stdin.isatty() and input("\n是否关闭 Chrome 浏览器? (y/N): ").lower() == 'y'
+        if close:
+            for p in chrome_processes:
+                p.terminate()
             print("浏览器已关闭")
         else:
             print("浏览器保持打开")
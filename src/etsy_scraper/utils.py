@@ -1,10 +1,26 @@
 """
-共享工具函数 - 图片选择和标题过滤
+共享工具函数 - 图片选择、标题过滤和 JSON 输出
 
 供 real_chrome_scraper.py 和 section_scraper.py 共用
 """
+import json
+import posixpath
 import re
-from typing import List
+from functools import lru_cache
+from typing import Any, List, Optional, Pattern, Tuple
+from urllib.parse import urlsplit
+
+# orjson 为可选依赖：安装后 JSON 序列化走 C 实现，否则回退到标准库
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# 图片选择中的一项：单个序号 "3" 或范围 "2-4"
+_SELECTION_PART_RE = re.compile(r'(\d+)(?:-(\d+))?')
+
+# 允许保存的图片扩展名，其余一律按 jpg 保存
+IMAGE_EXTENSIONS = frozenset({'jpg', 'jpeg', 'png', 'webp', 'gif'})
 
 
 def parse_image_selection(spec: str) -> List[int]:
@@ -30,38 +46,36 @@ def parse_image_selection(spec: str) -> List[int]:
         return []
     
     indices = set()
-    parts = spec.strip().split(',')
     
-    for part in parts:
+    for part in spec.split(','):
         part = part.strip()
         if not part:
             continue
-            
-        # 检查是否是范围格式 (如 "2-4")
-        if '-' in part:
-            range_match = re.match(r'^(\d+)-(\d+)$', part)
-            if not range_match:
+        
+        # 单个序号 "3" 或范围 "2-4"，一个预编译正则同时识别
+        match = _SELECTION_PART_RE.fullmatch(part)
+        if not match:
+            if '-' in part:
                 raise ValueError(
                     f"无效的范围格式: '{part}'\n"
                     f"正确格式示例: '2-4' 表示第2到4张"
                 )
-            start, end = int(range_match.group(1)), int(range_match.group(2))
-            if start < 1:
-                raise ValueError(f"图片序号必须从 1 开始，不能是 {start}")
-            if start > end:
-                raise ValueError(f"范围起始值 {start} 不能大于结束值 {end}")
-            indices.update(range(start, end + 1))
-        else:
-            # 单个数字
-            if not part.isdigit():
-                raise ValueError(
-                    f"无效的图片序号: '{part}'\n"
-                    f"正确格式示例: '1' 或 '1,3,5' 或 '2-4' 或 '1,3-5,8'"
-                )
-            num = int(part)
-            if num < 1:
-                raise ValueError(f"图片序号必须从 1 开始，不能是 {num}")
-            indices.add(num)
+            raise ValueError(
+                f"无效的图片序号: '{part}'\n"
+                f"正确格式示例: '1' 或 '1,3,5' 或 '2-4' 或 '1,3-5,8'"
+            )
+        
+        start, end = match.groups()
+        start = int(start)
+        if start < 1:
+            raise ValueError(f"图片序号必须从 1 开始，不能是 {start}")
+        if end is None:
+            indices.add(start)
+            continue
+        end = int(end)
+        if start > end:
+            raise ValueError(f"范围起始值 {start} 不能大于结束值 {end}")
+        indices.update(range(start, end + 1))
     
     return sorted(indices)
 
@@ -86,28 +100,84 @@ def filter_title(title: str, filter_words: List[str]) -> str:
     if not title:
         return "untitled"
     
-    if not filter_words:
+    # 同一组屏蔽词的正则由 compile_filter 缓存
+    pattern = compile_filter(tuple(filter_words)) if filter_words else None
+    if pattern is None:
         return title
     
-    result = title
+    # 一次扫描移除所有屏蔽词，并清理多余空格；结果为空时返回默认值
+    return ' '.join(pattern.sub('', title).split()) or "untitled"
+
+
+class TitleFilter:
+    """
+    标题屏蔽词过滤器
     
-    for word in filter_words:
-        if not word:
-            continue
-        # 大小写不敏感的替换
-        # 使用正则表达式确保匹配完整词汇（避免 "art" 误删 "heart" 中的部分）
-        # 但为了简单起见，先用简单的替换，后续可以优化
-        pattern = re.compile(re.escape(word), re.IGNORECASE)
-        result = pattern.sub('', result)
+    每次运行构造一次并传给下游，之后每个标题只做一次正则替换；
+    规则同 filter_title。apply 的结果按标题缓存（同名商品很常见）
+    """
     
-    # 清理多余空格
-    result = ' '.join(result.split())
+    __slots__ = ('words', '_lowered', '_pattern', 'apply')
     
-    # 如果结果为空，返回默认值
-    if not result.strip():
-        return "untitled"
+    def __init__(self, filter_words: Optional[List[str]] = None):
+        """
+        Args:
+            filter_words: 要过滤的词汇列表，None 或空列表表示不过滤
+        """
+        self.words: Tuple[str, ...] = tuple(w for w in filter_words or () if w)
+        self._lowered: Tuple[str, ...] = tuple(dict.fromkeys(w.lower() for w in self.words))
+        self._pattern = compile_filter(self.words) if self.words else None
+        # 每个实例一个有界缓存（不同屏蔽词的实例互不影响）
+        self.apply = lru_cache(maxsize=4096)(self._apply)
     
-    return result.strip()
+    def __bool__(self) -> bool:
+        return self._pattern is not None
+    
+    def _apply(self, title: str) -> str:
+        """
+        过滤标题（通过实例的 apply 调用，结果会被缓存）
+        
+        Args:
+            title: 原始商品标题
+            
+        Returns:
+            过滤后的标题
+        """
+        if not title:
+            return "untitled"
+        
+        if self._pattern is None:
+            return title
+        
+        # 大多数标题不含任何屏蔽词：先做 C 层面的子串查找，命中时才走正则替换
+        lowered = title.lower()
+        if any(w in lowered for w in self._lowered):
+            title = self._pattern.sub('', title)
+        
+        # 清理多余空格
+        result = ' '.join(title.split())
+        
+        # 如果结果为空，返回默认值
+        return result or "untitled"
+
+
+@lru_cache(maxsize=32)
+def compile_filter(filter_words: Tuple[str, ...]) -> Optional[Pattern[str]]:
+    """
+    将屏蔽词编译为一个大小写不敏感的子串匹配正则（同一组屏蔽词只编译一次）
+    
+    长词优先匹配，"Wall Art" 不会先被 "Art" 拆开
+    
+    Args:
+        filter_words: 屏蔽词元组
+        
+    Returns:
+        预编译的正则；没有有效屏蔽词时返回 None
+    """
+    words = sorted({w for w in filter_words if w}, key=len, reverse=True)
+    if not words:
+        return None
+    return re.compile('|'.join(map(re.escape, words)), re.IGNORECASE)
 
 
 def parse_filter_words(spec: str) -> List[str]:
@@ -121,15 +191,73 @@ def parse_filter_words(spec: str) -> List[str]:
         spec: 屏蔽词规格字符串
         
     Returns:
-        清理后的屏蔽词列表
+        清理后的屏蔽词列表（去重，保留首次出现的顺序）
     """
     if not spec or not spec.strip():
         return []
     
-    words = []
-    for word in spec.split(','):
-        word = word.strip()
-        if word:
-            words.append(word)
+    return list(dict.fromkeys(word for word in map(str.strip, spec.split(',')) if word))
+
+
+def image_extension(url: str) -> str:
+    """
+    从图片 URL 的路径部分解析扩展名
+    
+    只看路径，查询参数中的 "." 不会干扰；不在 IMAGE_EXTENSIONS 中的一律返回 "jpg"
+    
+    Args:
+        url: 图片 URL
+        
+    Returns:
+        小写扩展名（不含点）
+    """
+    ext = posixpath.splitext(urlsplit(url).path)[1].lstrip('.').lower()
+    return ext if ext in IMAGE_EXTENSIONS else 'jpg'
+
+
+def dumps_json(data: Any) -> bytes:
+    """
+    将数据序列化为缩进 2 格的 UTF-8 JSON 字节（保留非 ASCII 字符）
+    
+    Args:
+        data: 要序列化的数据
+        
+    Returns:
+        UTF-8 编码的 JSON 字节，可直接 write_bytes
+    """
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+
+
+def dumps_compact_json(data: Any) -> bytes:
+    """
+    将数据序列化为紧凑（无缩进、无多余空格）的 UTF-8 JSON 字节
+    
+    Args:
+        data: 要序列化的数据
+        
+    Returns:
+        UTF-8 编码的 JSON 字节
+    """
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def loads_json(data: bytes) -> Any:
+    """
+    解析 UTF-8 JSON 字节（安装了 orjson 时使用 orjson）
     
-    return words
+    Args:
+        data: JSON 字节，通常来自 Path.read_bytes()
+        
+    Returns:
+        解析后的数据
+        
+    Raises:
+        json.JSONDecodeError: JSON 格式无效（orjson 的异常也是其子类）
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)